@@ -13,19 +13,65 @@ import geopandas as gpd
 import numpy as np
 import networkx as nx
 import pickle
+import io
 import json
+import sys
 import math
 import bisect
-import time
+import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Set, NamedTuple
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
+from functools import lru_cache
 import warnings
 
+from raptor_utils import coords_array, json_bytes
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+try:
+    from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
 warnings.filterwarnings('ignore')
 
+# 따릉이 요금
+BIKE_BASE_FARE = 1000   # 기본 30분
+BIKE_EXTRA_FARE = 1000  # 초과 30분당
+
+# 노선명 정리용 정규식 (신분당선이 분당선보다 먼저 매칭되어야 함)
+_BUS_NUM_RE = re.compile(r'\d+')
+_SUBWAY_MAP = [
+    (re.compile(r'2'), "지하철 2호선"),
+    (re.compile(r'7'), "지하철 7호선"),
+    (re.compile(r'9'), "지하철 9호선"),
+    (re.compile(r'신분당'), "신분당선"),
+    (re.compile(r'분당'), "분당선"),
+]
+
+# GeoJSON 포인트 feature 템플릿 (문자열 값은 JSON 이스케이프된 상태로 삽입)
+_POINT_FEATURE_TMPL = (
+    '{{"type":"Feature","properties":{{"journey_id":{jid},"segment_id":{sid},"point_id":{pid},'
+    '"mode":{mode},"route_info":{ri},"marker_color":"{color}","marker_size":"{size}"}},'
+    '"geometry":{{"type":"Point","coordinates":[{lon},{lat}]}}}}'
+)
+
+# 하루(0~1439분) 시각 문자열 조회 테이블
+_MIN_TO_TIME = tuple(f"{m // 60:02d}:{m % 60:02d}" for m in range(1440))
+
 # =============================================================================
 # 핵심 데이터 구조 정의
 # =============================================================================
@@ -87,7 +133,7 @@ class RoadSegment:
     walk_time: float
     bike_time: float
 
-@dataclass
+@dataclass(slots=True)
 class Journey:
     """완전한 여행 경로"""
     total_time: int
@@ -97,13 +143,13 @@ class Journey:
     departure_time: int
     arrival_time: int
     segments: List[Dict]
-    route_coordinates: List[Tuple[float, float]] = field(default_factory=list)
+    route_coordinates: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.float64))  # (N, 2) [lat, lon]
     pareto_rank: int = 1
     journey_type: str = "mixed"  # walk, bike, transit, mixed
 
-@dataclass
+@dataclass(slots=True)
 class RaptorLabel:
-    """RAPTOR 레이블 (각 정류장의 최적 도착 정보)"""
+    """RAPTOR 레이블 (각 정류장의 최적 도착 정보, 결과 변환 시에만 생성)"""
     arrival_time: int = float('inf')
     transfers: int = 0
     cost: float = 0.0
@@ -114,6 +160,173 @@ class RaptorLabel:
     round_number: int = 0
     boarding_time: int = 0
 
+UNREACHED = 1 << 60  # 미도달 정류장 도착시간
+JOURNEY_TYPES = ('walk', 'bike', 'transit', 'mixed')
+ACCESS_MODES = ('walk', 'bike', 'transit')
+
+@dataclass
+class RaptorLabels:
+    """RAPTOR 레이블 SoA (정류장 인덱스별 배열, 인덱스 -1은 없음)"""
+    arrival_time: np.ndarray
+    transfers: np.ndarray
+    cost: np.ndarray
+    parent_stop: np.ndarray
+    trip: np.ndarray
+    route: np.ndarray
+    access_mode: np.ndarray  # ACCESS_MODES 인덱스
+    round_number: np.ndarray
+    boarding_time: np.ndarray
+
+    @classmethod
+    def empty(cls, n_stops: int) -> 'RaptorLabels':
+        return cls(
+            arrival_time=np.full(n_stops, UNREACHED, dtype=np.int64),
+            transfers=np.zeros(n_stops, dtype=np.int64),
+            cost=np.zeros(n_stops, dtype=np.float64),
+            parent_stop=np.full(n_stops, -1, dtype=np.int64),
+            trip=np.full(n_stops, -1, dtype=np.int64),
+            route=np.full(n_stops, -1, dtype=np.int64),
+            access_mode=np.zeros(n_stops, dtype=np.int8),
+            round_number=np.zeros(n_stops, dtype=np.int64),
+            boarding_time=np.zeros(n_stops, dtype=np.int64)
+        )
+
+    def copy(self) -> 'RaptorLabels':
+        return RaptorLabels(*(getattr(self, f).copy() for f in self.__dataclass_fields__))
+
+@dataclass
+class JourneyBatch:
+    """Journey 목록의 SoA 뷰 (정렬/그룹화는 배열로, Journey는 출력 시에만 사용)"""
+    times: np.ndarray      # float32
+    costs: np.ndarray      # float32
+    transfers: np.ndarray  # int16
+    types: np.ndarray      # int8, JOURNEY_TYPES 인덱스
+    ranks: np.ndarray      # float64
+    payload: List[Journey]
+
+    @classmethod
+    def from_journeys(cls, journeys: List[Journey]) -> 'JourneyBatch':
+        type_code = {t: i for i, t in enumerate(JOURNEY_TYPES)}
+        return cls(
+            times=np.array([j.total_time for j in journeys], dtype=np.float32),
+            costs=np.array([j.total_cost for j in journeys], dtype=np.float32),
+            transfers=np.array([j.total_transfers for j in journeys], dtype=np.int16),
+            types=np.array([type_code[j.journey_type] for j in journeys], dtype=np.int8),
+            ranks=np.array([j.pareto_rank for j in journeys], dtype=np.float64),
+            payload=list(journeys)
+        )
+
+    def take(self, idx: np.ndarray) -> 'JourneyBatch':
+        """인덱스 배열 순서대로 부분 배치 생성"""
+        return JourneyBatch(
+            times=self.times[idx], costs=self.costs[idx], transfers=self.transfers[idx],
+            types=self.types[idx], ranks=self.ranks[idx],
+            payload=[self.payload[i] for i in idx.tolist()]
+        )
+
+    def to_journeys(self) -> List[Journey]:
+        """순위를 Journey에 반영해 반환"""
+        for journey, rank in zip(self.payload, self.ranks.tolist()):
+            journey.pareto_rank = rank
+        return list(self.payload)
+
+# =============================================================================
+# JIT 커널 (numba 미설치 시 순수 Python으로 동작)
+# =============================================================================
+
+@njit(parallel=True, cache=True)
+def _find_best_trips_kernel(routes_to_scan, route_stops_ptr, route_stops,
+                            route_trips_ptr, route_trips,
+                            trip_st_ptr, trip_st_stop, trip_st_dep,
+                            marked, board_ready):
+    """노선별 최적 trip 탐색 (노선 간 독립 → prange 병렬)
+
+    각 노선은 자신의 결과 슬롯에만 쓰므로 쓰기 충돌이 없고,
+    레이블 갱신(최소값 reduction)은 호출 측에서 순차적으로 수행한다.
+    """
+    n = routes_to_scan.shape[0]
+    best_trip = np.full(n, -1, dtype=np.int64)
+    best_stop = np.full(n, -1, dtype=np.int64)
+    best_dep = np.full(n, -1, dtype=np.int64)
+
+    for i in prange(n):
+        r = routes_to_scan[i]
+        earliest_departure = 1 << 62
+
+        for p in range(route_stops_ptr[r], route_stops_ptr[r + 1]):
+            s = route_stops[p]
+            if not marked[s]:
+                continue
+            earliest_board_time = board_ready[s]
+
+            for q in range(route_trips_ptr[r], route_trips_ptr[r + 1]):
+                t = route_trips[q]
+                for k in range(trip_st_ptr[t], trip_st_ptr[t + 1]):
+                    if trip_st_stop[k] == s and trip_st_dep[k] >= earliest_board_time:
+                        if trip_st_dep[k] < earliest_departure:
+                            earliest_departure = trip_st_dep[k]
+                            best_trip[i] = t
+                            best_stop[i] = s
+                            best_dep[i] = trip_st_dep[k]
+                        break
+
+    return best_trip, best_stop, best_dep
+
+@njit(cache=True)
+def _score_kernel(times, costs, transfers, time_weight, cost_weight, transfer_weight):
+    """다중기준 점수 (정규화 기준: 60분, 3000원, 환승 3회)"""
+    return (np.minimum(times / 60.0, 1.0) * time_weight +
+            np.minimum(costs / 3000.0, 1.0) * cost_weight +
+            np.minimum(transfers / 3.0, 1.0) * transfer_weight)
+
+@njit(parallel=True, cache=True)
+def _pareto_mask_kernel(t, c, tr):
+    """비지배(Pareto) 여부 마스크 (O(n²), 행별 독립 → prange 병렬)"""
+    n = t.shape[0]
+    mask = np.ones(n, dtype=np.bool_)
+    for i in prange(n):
+        for j in range(n):
+            if (j != i and t[j] <= t[i] and c[j] <= c[i] and tr[j] <= tr[i] and
+                    (t[j] < t[i] or c[j] < c[i] or tr[j] < tr[i])):
+                mask[i] = False
+                break
+    return mask
+
+PARETO_JIT_MIN = 32  # 이보다 작은 그룹은 브로드캐스트 비교가 JIT 호출보다 빠름
+
+def _pareto_mask(arr: np.ndarray) -> np.ndarray:
+    """(n, 3) [시간, 비용, 환승] 배열의 Pareto front 마스크"""
+    if NUMBA_AVAILABLE and len(arr) >= PARETO_JIT_MIN:
+        return _pareto_mask_kernel(np.ascontiguousarray(arr[:, 0]),
+                                   np.ascontiguousarray(arr[:, 1]),
+                                   np.ascontiguousarray(arr[:, 2]))
+    # dominates[a, b]: a가 모든 기준에서 b 이하이고 하나 이상에서 더 좋음
+    dominates = (np.all(arr[:, None, :] <= arr[None, :, :], axis=2) &
+                 np.any(arr[:, None, :] < arr[None, :, :], axis=2))
+    return ~dominates.any(axis=0)
+
+def _csr_rows(ptr: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR 배열에서 여러 행의 원소 위치와 원소별 행 번호를 반환"""
+    starts = ptr[rows]
+    counts = ptr[rows + 1] - starts
+    offsets = np.repeat(starts - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+    return offsets, np.repeat(rows, counts)
+
+def haversine_vec(lat: float, lon: float, lats_rad: np.ndarray, lons_rad: np.ndarray,
+                  cos_lats: Optional[np.ndarray] = None) -> np.ndarray:
+    """한 지점에서 여러 지점까지의 하버사인 거리 일괄 계산 (km)
+
+    lats_rad/lons_rad는 라디안 배열, cos_lats는 미리 계산한 cos(lats_rad)
+    """
+    lat_rad = math.radians(lat)
+    lon_rad = math.radians(lon)
+    if cos_lats is None:
+        cos_lats = np.cos(lats_rad)
+
+    a = (np.sin((lats_rad - lat_rad) * 0.5) ** 2 +
+         math.cos(lat_rad) * cos_lats * np.sin((lons_rad - lon_rad) * 0.5) ** 2)
+    return 6371 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
 # =============================================================================
 # 메인 RAPTOR 엔진 클래스
 # =============================================================================
@@ -121,6 +334,23 @@ class RaptorLabel:
 class GangnamMultiModalRAPTOR:
     """강남구 Multi-modal RAPTOR 엔진 v3.0"""
     
+    # 출력용 이모지 (교통수단 / 구간 이동수단)
+    _TRANSPORT_EMOJI = {
+        'walk': '🚶‍♂️',
+        'bike': '🚲',
+        'transit': '🚇',
+        'mixed': '🔄'
+    }
+    _MODE_EMOJI = {
+        'walk': '🚶‍♂️',
+        'bike': '🚲',
+        'bike_rental': '🔄',
+        'bike_return': '🔄',
+        'transit': '🚇',
+        'bus': '🚌',
+        'subway': '🚇'
+    }
+    
     def __init__(self, data_path: str):
         self.data_path = Path(data_path)
         
@@ -151,11 +381,15 @@ class GangnamMultiModalRAPTOR:
         # 요금 정보
         self.BASE_TRANSIT_FARE = 1370  # 지하철
         self.BASE_BUS_FARE = 1200     # 버스
-        self.BIKE_BASE_FARE = 1000    # 따릉이 30분
+        self.BIKE_BASE_FARE = BIKE_BASE_FARE  # 따릉이 30분
         self.TRANSFER_DISCOUNT = 300
         
         print("🚀 강남구 Multi-modal RAPTOR 엔진 v3.0 초기화")
         self._load_all_data()
+
+        # JIT 커널 사전 컴파일 (첫 경로 탐색 지연 방지)
+        if NUMBA_AVAILABLE:
+            _score_kernel(np.zeros(1), np.zeros(1), np.zeros(1), 0.5, 0.2, 0.3)
     
     def _load_all_data(self):
         """모든 데이터 로드"""
@@ -369,6 +603,26 @@ class GangnamMultiModalRAPTOR:
         if self.road_graph is None:
             print("     🔧 기본 도로 네트워크 생성...")
             self._create_basic_road_network()
+
+        self._build_road_matrices()
+
+    def _build_road_matrices(self):
+        """도로 그래프를 CSR 가중치 행렬로 변환 (SciPy Dijkstra용)"""
+        self._road_nodes = list(self.road_graph.nodes())
+        self._road_node_index = {node: i for i, node in enumerate(self._road_nodes)}
+        self._road_matrices = {}
+
+        # 경로 캐시는 인스턴스/행렬 단위로 보관 (재구축 시 이전 그래프 참조를 함께 해제)
+        self._shortest_road_path = lru_cache(maxsize=100_000)(self._compute_shortest_road_path)
+        self._road_sssp = lru_cache(maxsize=32)(self._compute_road_sssp)
+
+        if not SCIPY_AVAILABLE or not self._road_nodes:
+            return
+
+        for mode, weight in (('walk', 'walk_time'), ('bike', 'bike_time')):
+            self._road_matrices[mode] = nx.to_scipy_sparse_array(
+                self.road_graph, nodelist=self._road_nodes, weight=weight, format='csr'
+            )
     
     def _create_basic_road_network(self):
         """기본 도로 네트워크 생성 (그래프가 없는 경우)"""
@@ -389,20 +643,25 @@ class GangnamMultiModalRAPTOR:
         # 그래프에 노드 추가
         self.road_graph.add_nodes_from(nodes)
         
-        # 인접한 노드들 간 엣지 생성
+        # 인접한 노드들 간 엣지 생성 (행 단위 벡터화)
+        node_lats_rad = np.radians([node[0] for node in nodes])
+        node_lons_rad = np.radians([node[1] for node in nodes])
+        node_cos_lats = np.cos(node_lats_rad)
+
         for i, (lat1, lon1) in enumerate(nodes):
-            for lat2, lon2 in nodes[i+1:]:
-                distance = self._haversine_distance(lat1, lon1, lat2, lon2)
-                if distance <= 0.15:  # 150m 이내 연결
-                    walk_time = (distance / self.WALK_SPEED) * 60
-                    bike_time = (distance / self.BIKE_SPEED) * 60
-                    
-                    self.road_graph.add_edge(
-                        (lat1, lon1), (lat2, lon2),
-                        distance=distance,
-                        walk_time=walk_time,
-                        bike_time=bike_time
-                    )
+            distances = haversine_vec(lat1, lon1, node_lats_rad[i+1:], node_lons_rad[i+1:],
+                                      node_cos_lats[i+1:])
+            for offset in np.flatnonzero(distances <= 0.15).tolist():  # 150m 이내 연결
+                distance = float(distances[offset])
+                walk_time = (distance / self.WALK_SPEED) * 60
+                bike_time = (distance / self.BIKE_SPEED) * 60
+
+                self.road_graph.add_edge(
+                    (lat1, lon1), nodes[i + 1 + offset],
+                    distance=distance,
+                    walk_time=walk_time,
+                    bike_time=bike_time
+                )
         
         print(f"     ✅ 기본 그리드 생성: {self.road_graph.number_of_nodes():,}개 노드, {self.road_graph.number_of_edges():,}개 엣지")
     
@@ -419,8 +678,96 @@ class GangnamMultiModalRAPTOR:
         
         # 환승 정보 최적화
         self._optimize_transfers()
-        
+
+        # 노선 스캔 커널용 정수 인덱스 배열
+        self._build_index_arrays()
+
         print("     ✅ 최적화 완료")
+
+    def _build_index_arrays(self):
+        """정류장/노선/trip을 정수 인덱스 CSR 배열로 변환 (JIT 커널 입력)"""
+        # 정류장 ID → 정수 인덱스
+        self.stop_ids: List[str] = []
+        self.stop_index: Dict[str, int] = {}
+
+        def _stop_idx(stop_id: str) -> int:
+            idx = self.stop_index.get(stop_id)
+            if idx is None:
+                idx = len(self.stop_ids)
+                self.stop_index[stop_id] = idx
+                self.stop_ids.append(stop_id)
+            return idx
+
+        for stop_id in self.stops:
+            _stop_idx(stop_id)
+
+        # trip별 정차 시간 (CSR)
+        self.trip_ids: List[str] = list(self.trips.keys())
+        self.trip_index: Dict[str, int] = {trip_id: i for i, trip_id in enumerate(self.trip_ids)}
+
+        trip_st_ptr = [0]
+        trip_st_stop, trip_st_arr, trip_st_dep = [], [], []
+        for trip_id in self.trip_ids:
+            for stop_time in self.trips[trip_id].stop_times:
+                trip_st_stop.append(_stop_idx(stop_time.stop_id))
+                trip_st_arr.append(stop_time.arrival_time)
+                trip_st_dep.append(stop_time.departure_time)
+            trip_st_ptr.append(len(trip_st_stop))
+
+        # 노선별 정류장 패턴 / 시간순 trip 목록 (CSR)
+        self.route_ids: List[str] = list(self.routes.keys())
+        self.route_index: Dict[str, int] = {route_id: i for i, route_id in enumerate(self.route_ids)}
+
+        route_stops_ptr, route_trips_ptr = [0], [0]
+        route_stops, route_trips = [], []
+        for route_id in self.route_ids:
+            route_stops.extend(_stop_idx(stop_id) for stop_id in self.routes[route_id].stop_pattern)
+            route_stops_ptr.append(len(route_stops))
+            route_trips.extend(self.trip_index[trip_id] for trip_id, _ in self.route_to_trips.get(route_id, [])
+                               if trip_id in self.trip_index)
+            route_trips_ptr.append(len(route_trips))
+
+        self._trip_st_ptr = np.asarray(trip_st_ptr, dtype=np.int64)
+        self._trip_st_stop = np.asarray(trip_st_stop, dtype=np.int64)
+        self._trip_st_arr = np.asarray(trip_st_arr, dtype=np.int64)
+        self._trip_st_dep = np.asarray(trip_st_dep, dtype=np.int64)
+        self._route_stops_ptr = np.asarray(route_stops_ptr, dtype=np.int64)
+        self._route_stops = np.asarray(route_stops, dtype=np.int64)
+        self._route_trips_ptr = np.asarray(route_trips_ptr, dtype=np.int64)
+        self._route_trips = np.asarray(route_trips, dtype=np.int64)
+
+        # 노선별 정류장 → 패턴 내 첫 위치
+        self._route_stop_positions: Dict[str, Dict[str, int]] = {}
+        for route_id, route in self.routes.items():
+            positions = {}
+            for position, stop_id in enumerate(route.stop_pattern):
+                positions.setdefault(stop_id, position)
+            self._route_stop_positions[route_id] = positions
+
+        # 정류장별 환승 (CSR)
+        transfers_ptr = [0]
+        transfers_to, transfers_time = [], []
+        for stop_id in self.stop_ids:
+            for transfer_stop_id, transfer_time in self.transfers.get(stop_id, []):
+                if transfer_stop_id in self.stop_index:
+                    transfers_to.append(self.stop_index[transfer_stop_id])
+                    transfers_time.append(transfer_time)
+            transfers_ptr.append(len(transfers_to))
+
+        self._transfers_ptr = np.asarray(transfers_ptr, dtype=np.int64)
+        self._transfers_to = np.asarray(transfers_to, dtype=np.int64)
+        self._transfers_time = np.asarray(transfers_time, dtype=np.int64)
+
+        # 정류장별 경유 노선 (CSR)
+        stop_routes_ptr = [0]
+        stop_routes = []
+        for stop_id in self.stop_ids:
+            stop_routes.extend(self.route_index[route_id] for route_id in self.stop_to_routes.get(stop_id, [])
+                               if route_id in self.route_index)
+            stop_routes_ptr.append(len(stop_routes))
+
+        self._stop_routes_ptr = np.asarray(stop_routes_ptr, dtype=np.int64)
+        self._stop_routes = np.asarray(stop_routes, dtype=np.int64)
     
     def _build_spatial_index(self):
         """공간 인덱스 구축"""
@@ -443,6 +790,21 @@ class GangnamMultiModalRAPTOR:
             if key not in self.spatial_index['bikes']:
                 self.spatial_index['bikes'][key] = []
             self.spatial_index['bikes'][key].append(station_id)
+
+        # 일괄 거리 계산용 좌표 배열 (라디안, cos 미리 계산)
+        self._stop_keys = list(self.stops.keys())
+        self._stop_lat_rad = np.radians(np.array([s.stop_lat for s in self.stops.values()], dtype=np.float64))
+        self._stop_lon_rad = np.radians(np.array([s.stop_lon for s in self.stops.values()], dtype=np.float64))
+        self._stop_cos_lat = np.cos(self._stop_lat_rad)
+
+        self._bike_keys = list(self.bike_stations.keys())
+        self._bike_lat_rad = np.radians(np.array([b.lat for b in self.bike_stations.values()], dtype=np.float64))
+        self._bike_lon_rad = np.radians(np.array([b.lon for b in self.bike_stations.values()], dtype=np.float64))
+        self._bike_cos_lat = np.cos(self._bike_lat_rad)
+
+        self._node_lat_rad = np.radians(np.array([node[0] for node in self._road_nodes], dtype=np.float64))
+        self._node_lon_rad = np.radians(np.array([node[1] for node in self._road_nodes], dtype=np.float64))
+        self._node_cos_lat = np.cos(self._node_lat_rad)
     
     def _optimize_transfers(self):
         """환승 정보 최적화"""
@@ -466,18 +828,12 @@ class GangnamMultiModalRAPTOR:
             return []
         
         origin_stop = self.stops[stop_id]
-        nearby_stops = []
-        
-        for other_stop_id, other_stop in self.stops.items():
-            if other_stop_id != stop_id:
-                distance = self._haversine_distance(
-                    origin_stop.stop_lat, origin_stop.stop_lon,
-                    other_stop.stop_lat, other_stop.stop_lon
-                )
-                if distance <= max_distance:
-                    nearby_stops.append((other_stop_id, distance))
-        
-        return sorted(nearby_stops, key=lambda x: x[1])
+        nearby_stops = self._find_nearby_stops_from_point(
+            origin_stop.stop_lat, origin_stop.stop_lon, max_distance
+        )
+
+        return [(other_stop_id, distance) for other_stop_id, distance in nearby_stops
+                if other_stop_id != stop_id]
     
     def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """하버사인 공식으로 거리 계산 (km)"""
@@ -720,7 +1076,7 @@ class GangnamMultiModalRAPTOR:
                     total_distance = max(0.5, walk_to_start_dist + bike_dist + walk_to_dest_dist)
                     
                     # 전체 경로 좌표
-                    all_coordinates = coords1 + coords2 + coords3
+                    all_coordinates = np.concatenate([coords1, coords2, coords3])
                     
                     # 대여소 이름 정리 (인코딩 문제 해결)
                     start_name = self._clean_station_name(start_station.name)
@@ -961,60 +1317,76 @@ class GangnamMultiModalRAPTOR:
         
         print(f"     🔄 RAPTOR 알고리즘 시작...")
         
-        # 초기화
-        best_labels = {}  # stop_id -> RaptorLabel
-        marked_stops = set()
-        
-        # Round 0: Access stops 초기화
-        for access in access_stops:
-            stop_id = access['stop_id']
-            arrival_time = dep_time + access['access_time']
-            
-            best_labels[stop_id] = RaptorLabel(
-                arrival_time=arrival_time,
-                transfers=0,
-                cost=0.0,
-                access_mode=access['mode'],
-                round_number=0
-            )
-            marked_stops.add(stop_id)
+        # 초기화 (정류장 인덱스 기반 SoA 레이블)
+        n_stops = len(self.stop_ids)
+        labels = RaptorLabels.empty(n_stops)
+        marked = np.zeros(n_stops, dtype=np.bool_)
+        
+        # Round 0: Access stops 초기화 (일괄 scatter)
+        if access_stops:
+            access_idx = np.fromiter((self.stop_index[a['stop_id']] for a in access_stops),
+                                     dtype=np.int64, count=len(access_stops))
+            access_times = np.fromiter((dep_time + a['access_time'] for a in access_stops),
+                                       dtype=np.int64, count=len(access_stops))
+            access_modes = np.fromiter((ACCESS_MODES.index(a['mode']) for a in access_stops),
+                                       dtype=np.int8, count=len(access_stops))
+
+            # 같은 정류장은 가장 빠른 접근(접근시간순 정렬의 첫 항목)만 사용
+            access_idx, first = np.unique(access_idx, return_index=True)
+            labels.arrival_time[access_idx] = access_times[first]
+            labels.access_mode[access_idx] = access_modes[first]
+            marked[access_idx] = True
         
-        print(f"       Round 0: {len(marked_stops)}개 접근점 초기화")
+        print(f"       Round 0: {int(marked.sum())}개 접근점 초기화")
+
+        # 목적지 pruning 기준 (하차 정류장별 최소 하차시간)
+        egress_times = {}
+        for egress in egress_stops:
+            egress_time = egress.get('egress_time', egress.get('access_time', 5))
+            egress_times[egress['stop_id']] = min(egress_time, egress_times.get(egress['stop_id'], egress_time))
+        egress_idx = np.array([self.stop_index[stop_id] for stop_id in egress_times], dtype=np.int64)
+        egress_time_arr = np.array(list(egress_times.values()), dtype=np.int64)
+        target_bound = self._target_bound(labels, egress_idx, egress_time_arr)
         
         # Rounds 1 to MAX_ROUNDS
         for round_num in range(1, self.MAX_ROUNDS + 1):
-            if not marked_stops:
+            if not marked.any():
                 break
             
-            new_marked_stops = set()
-            
+            new_marked = np.zeros(n_stops, dtype=np.bool_)
+
             # Route Scanning
-            scanned_routes = set()
-            for stop_id in marked_stops:
-                for route_id in self.stop_to_routes.get(stop_id, []):
-                    if route_id not in scanned_routes:
-                        scanned_routes.add(route_id)
-                        new_stops = self._scan_route(
-                            route_id, marked_stops, best_labels, dep_time, round_num
-                        )
-                        new_marked_stops.update(new_stops)
+            # 1) 마킹된 정류장을 지나는 노선 수집
+            offsets, _ = _csr_rows(self._stop_routes_ptr, np.flatnonzero(marked))
+            routes_to_scan = np.unique(self._stop_routes[offsets])
+
+            # 2) 노선별 최적 trip 탐색 (라운드 시작 시점 레이블 기준, 병렬)
+            round_labels = labels.copy()
+            best_trips = self._find_best_trips(routes_to_scan, marked, round_labels.arrival_time)
+
+            # 3) 레이블 갱신은 순차 reduction
+            for route_idx, best_trip in zip(routes_to_scan.tolist(), best_trips):
+                self._scan_route(
+                    route_idx, best_trip, round_labels, labels, round_num, target_bound, new_marked
+                )
             
-            # Transfer Processing
-            transfer_stops = self._process_transfers(best_labels, round_num)
-            new_marked_stops.update(transfer_stops)
+            # Transfer Processing (이번 라운드에 마킹/갱신된 정류장에서 출발)
+            self._process_transfers(labels, round_num, marked | new_marked, new_marked)
             
-            marked_stops = new_marked_stops
-            print(f"       Round {round_num}: {len(marked_stops)}개 정류장 업데이트")
+            marked = new_marked
+            target_bound = self._target_bound(labels, egress_idx, egress_time_arr)
+            print(f"       Round {round_num}: {int(marked.sum())}개 정류장 업데이트")
             
-            if not marked_stops:
+            if not marked.any():
                 break
         
         # 결과 수집
         results = []
         for egress in egress_stops:
             stop_id = egress['stop_id']
-            if stop_id in best_labels:
-                label = best_labels[stop_id]
+            idx = self.stop_index[stop_id]
+            if labels.arrival_time[idx] < UNREACHED:
+                label = self._label_at(labels, idx)
                 egress_time = egress.get('egress_time', egress.get('access_time', 5))  # 수정: 키 오류 방지
                 total_time = (label.arrival_time - dep_time) + egress_time
                 
@@ -1034,167 +1406,189 @@ class GangnamMultiModalRAPTOR:
         print(f"     ✅ RAPTOR 완료: {len(results)}개 경로 발견")
         return results
     
-    def _scan_route(self, route_id: str, marked_stops: Set[str],
-                   best_labels: Dict[str, RaptorLabel], dep_time: int,
-                   round_num: int) -> Set[str]:
-        """개별 노선 스캔"""
-        
-        if route_id not in self.routes:
-            return set()
-        
-        route = self.routes[route_id]
-        new_stops = set()
-        
-        # 이 노선의 최적 trip 찾기
-        best_trip = self._find_best_trip_for_route(
-            route_id, marked_stops, best_labels, dep_time
+    def _label_at(self, labels: RaptorLabels, idx: int) -> RaptorLabel:
+        """SoA 레이블의 한 정류장을 RaptorLabel 객체로 변환"""
+        parent_idx = int(labels.parent_stop[idx])
+        trip_idx = int(labels.trip[idx])
+        route_idx = int(labels.route[idx])
+
+        return RaptorLabel(
+            arrival_time=int(labels.arrival_time[idx]),
+            transfers=int(labels.transfers[idx]),
+            cost=float(labels.cost[idx]),
+            parent_stop=self.stop_ids[parent_idx] if parent_idx >= 0 else None,
+            trip_id=self.trip_ids[trip_idx] if trip_idx >= 0 else None,
+            route_id=self.route_ids[route_idx] if route_idx >= 0 else None,
+            access_mode=ACCESS_MODES[labels.access_mode[idx]],
+            round_number=int(labels.round_number[idx]),
+            boarding_time=int(labels.boarding_time[idx])
         )
-        
-        if not best_trip:
-            return new_stops
-        
-        trip_id, boarding_stop_id, boarding_time = best_trip
-        boarding_label = best_labels[boarding_stop_id]
-        
-        # Trip의 모든 후속 정류장 업데이트
-        if trip_id in self.trips:
-            trip = self.trips[trip_id]
-            boarding_found = False
-            
-            for stop_time in trip.stop_times:
-                # 탑승 정류장 찾기
-                if stop_time.stop_id == boarding_stop_id:
-                    boarding_found = True
-                    continue
-                
-                # 탑승 이후 정류장들만 처리
-                if not boarding_found:
-                    continue
-                
-                # 도착시간이 탑승시간보다 이후인지 확인
-                if stop_time.arrival_time <= boarding_time:
-                    continue
-                
-                # 새로운 레이블 계산
-                new_arrival = stop_time.arrival_time
-                new_transfers = boarding_label.transfers + 1
-                new_cost = boarding_label.cost + route.base_fare
-                
-                # 환승할인 적용
-                if boarding_label.transfers > 0:
-                    new_cost -= self.TRANSFER_DISCOUNT
-                
-                # 기존 레이블과 비교
-                if self._is_label_better(new_arrival, new_transfers, new_cost,
-                                       best_labels.get(stop_time.stop_id)):
-                    
-                    best_labels[stop_time.stop_id] = RaptorLabel(
-                        arrival_time=new_arrival,
-                        transfers=new_transfers,
-                        cost=new_cost,
-                        parent_stop=boarding_stop_id,
-                        trip_id=trip_id,
-                        route_id=route_id,
-                        access_mode='transit',
-                        round_number=round_num,
-                        boarding_time=boarding_time
-                    )
-                    new_stops.add(stop_time.stop_id)
-        
-        return new_stops
     
-    def _find_best_trip_for_route(self, route_id: str, marked_stops: Set[str],
-                                 best_labels: Dict[str, RaptorLabel],
-                                 dep_time: int) -> Optional[Tuple[str, str, int]]:
-        """노선에서 최적 trip 찾기"""
-        
-        best_option = None
-        earliest_departure = float('inf')
-        
-        # 이 노선의 정류장들 중 마킹된 것들
-        route_marked_stops = []
-        if route_id in self.routes:
-            for stop_id in self.routes[route_id].stop_pattern:
-                if stop_id in marked_stops:
-                    route_marked_stops.append(stop_id)
-        
-        # 각 마킹된 정류장에서 탑승 가능한 trip 찾기
-        for stop_id in route_marked_stops:
-            label = best_labels[stop_id]
-            earliest_board_time = label.arrival_time + 1  # 1분 여유
-            
-            # 이 노선의 trips 중에서 적합한 것 찾기
-            for trip_id, first_dep in self.route_to_trips.get(route_id, []):
-                if trip_id in self.trips:
-                    trip = self.trips[trip_id]
-                    
-                    # 이 정류장에서의 출발시간 찾기
-                    for stop_time in trip.stop_times:
-                        if (stop_time.stop_id == stop_id and 
-                            stop_time.departure_time >= earliest_board_time):
-                            
-                            if stop_time.departure_time < earliest_departure:
-                                earliest_departure = stop_time.departure_time
-                                best_option = (trip_id, stop_id, stop_time.departure_time)
-                            break
-        
-        return best_option
-    
-    def _process_transfers(self, best_labels: Dict[str, RaptorLabel],
-                          round_num: int) -> Set[str]:
-        """환승 처리"""
-        new_stops = set()
-        
-        # 현재 레이블의 복사본으로 안전한 iteration
-        current_labels = dict(best_labels)
-        
-        for stop_id, label in current_labels.items():
-            if stop_id in self.transfers:
-                for transfer_stop_id, transfer_time in self.transfers[stop_id]:
-                    new_arrival = label.arrival_time + transfer_time
-                    
-                    # 기존 레이블과 비교
-                    if self._is_label_better(new_arrival, label.transfers, label.cost,
-                                           best_labels.get(transfer_stop_id)):
-                        
-                        best_labels[transfer_stop_id] = RaptorLabel(
-                            arrival_time=new_arrival,
-                            transfers=label.transfers,
-                            cost=label.cost,
-                            parent_stop=stop_id,
-                            trip_id=label.trip_id,
-                            route_id=label.route_id,
-                            access_mode=label.access_mode,
-                            round_number=round_num,
-                            boarding_time=label.boarding_time
-                        )
-                        new_stops.add(transfer_stop_id)
-        
-        return new_stops
+    def _scan_route(self, route_idx: int, best_trip: Optional[Tuple[int, int, int]],
+                   round_labels: RaptorLabels, labels: RaptorLabels,
+                   round_num: int, target_bound: Tuple[float, float, float],
+                   new_marked: np.ndarray):
+        """개별 노선 스캔 (탑승 trip의 후속 정류장 일괄 갱신)"""
+
+        if best_trip is None:
+            return
+
+        trip_idx, boarding_idx, boarding_time = best_trip
+        route = self.routes[self.route_ids[route_idx]]
+
+        start, end = self._trip_st_ptr[trip_idx], self._trip_st_ptr[trip_idx + 1]
+        stops = self._trip_st_stop[start:end]
+        arrivals = self._trip_st_arr[start:end]
+
+        # 탑승 정류장 이후 정류장들만 처리 (탑승 정류장 재방문 제외)
+        boarding_pos = np.flatnonzero(stops == boarding_idx)
+        if not boarding_pos.size:
+            return
+        stops = stops[boarding_pos[0] + 1:]
+        arrivals = arrivals[boarding_pos[0] + 1:]
+
+        # 도착시간이 탑승시간보다 이후인지 확인
+        valid = (stops != boarding_idx) & (arrivals > boarding_time)
+        stops = stops[valid]
+        arrivals = arrivals[valid]
+
+        # 새로운 레이블 계산 (같은 trip 안에서 환승/비용은 고정)
+        boarding_transfers = int(round_labels.transfers[boarding_idx])
+        new_transfers = boarding_transfers + 1
+        new_cost = float(round_labels.cost[boarding_idx]) + route.base_fare
+
+        # 환승할인 적용
+        if boarding_transfers > 0:
+            new_cost -= self.TRANSFER_DISCOUNT
+
+        # 목적지 최적 레이블에 지배되는 첫 정류장부터 이후는 모두 지배됨 (도착시간 단조 증가)
+        if new_transfers >= target_bound[1] and new_cost >= target_bound[2]:
+            dominated = np.flatnonzero(arrivals >= target_bound[0])
+            if dominated.size:
+                stops = stops[:dominated[0]]
+                arrivals = arrivals[:dominated[0]]
+
+        # 같은 정류장을 다시 지나면 첫 방문(가장 이른 도착)만 비교
+        stops, first = np.unique(stops, return_index=True)
+        arrivals = arrivals[first]
+
+        # 기존 레이블과 비교
+        better = self._is_label_better(arrivals, new_transfers, new_cost,
+                                       labels.arrival_time[stops], labels.transfers[stops],
+                                       labels.cost[stops])
+        updated = stops[better]
+
+        labels.arrival_time[updated] = arrivals[better]
+        labels.transfers[updated] = new_transfers
+        labels.cost[updated] = new_cost
+        labels.parent_stop[updated] = boarding_idx
+        labels.trip[updated] = trip_idx
+        labels.route[updated] = route_idx
+        labels.access_mode[updated] = ACCESS_MODES.index('transit')
+        labels.round_number[updated] = round_num
+        labels.boarding_time[updated] = boarding_time
+        new_marked[updated] = True
+
+    def _target_bound(self, labels: RaptorLabels, egress_idx: np.ndarray,
+                      egress_time: np.ndarray) -> Tuple[float, float, float]:
+        """현재까지 최적 목적지 도착 (하차시간 포함 도착, 환승, 비용)
+
+        경로로 복원되는 대중교통 레이블(trip 있음)만 기준으로 삼는다. 도보 접근만으로
+        도달한 Round 0 레이블은 여정이 되지 않으므로 대중교통 도착을 잘라내면 안 된다.
+        """
+        arrivals = labels.arrival_time[egress_idx]
+        reached = (arrivals < UNREACHED) & (labels.trip[egress_idx] >= 0)
+        if not reached.any():
+            return (float('inf'), float('inf'), float('inf'))
+
+        totals = arrivals[reached] + egress_time[reached]
+        transfers = labels.transfers[egress_idx][reached]
+        costs = labels.cost[egress_idx][reached]
+        best = np.lexsort((costs, transfers, totals))[0]
+        return (int(totals[best]), int(transfers[best]), float(costs[best]))
+
+    def _find_best_trips(self, routes_to_scan: np.ndarray, marked: np.ndarray,
+                         round_arrival: np.ndarray) -> List[Optional[Tuple[int, int, int]]]:
+        """노선들의 최적 trip 일괄 탐색 ((trip, 탑승 정류장, 출발시각) 인덱스, 노선 순서대로)"""
+        if not routes_to_scan.size:
+            return []
+
+        # 탑승 가능 시각 (도착 + 1분 여유)
+        board_ready = round_arrival + 1
+
+        best_trip, best_stop, best_dep = _find_best_trips_kernel(
+            routes_to_scan, self._route_stops_ptr, self._route_stops,
+            self._route_trips_ptr, self._route_trips,
+            self._trip_st_ptr, self._trip_st_stop, self._trip_st_dep,
+            marked, board_ready
+        )
+
+        return [
+            (t, s, d) if t >= 0 else None
+            for t, s, d in zip(best_trip.tolist(), best_stop.tolist(), best_dep.tolist())
+        ]
+
+    def _process_transfers(self, labels: RaptorLabels, round_num: int,
+                           sources: np.ndarray, new_marked: np.ndarray):
+        """환승 처리 (CSR 환승 배열 일괄 계산)"""
+        offsets, src = _csr_rows(self._transfers_ptr, np.flatnonzero(sources))
+        if not offsets.size:
+            return
+
+        targets = self._transfers_to[offsets]
+        new_arrival = labels.arrival_time[src] + self._transfers_time[offsets]
+        new_transfers = labels.transfers[src]
+        new_cost = labels.cost[src]
+
+        # 기존 레이블과 비교
+        better = self._is_label_better(new_arrival, new_transfers, new_cost,
+                                       labels.arrival_time[targets], labels.transfers[targets],
+                                       labels.cost[targets])
+        if not better.any():
+            return
+
+        targets, src = targets[better], src[better]
+        new_arrival, new_transfers, new_cost = new_arrival[better], new_transfers[better], new_cost[better]
+
+        # 같은 정류장으로 여러 환승이 들어오면 (도착, 환승, 비용) 최선 하나만 반영
+        order = np.lexsort((new_cost, new_transfers, new_arrival))
+        _, first = np.unique(targets[order], return_index=True)
+        pick = order[first]
+        targets, src = targets[pick], src[pick]
+
+        # 출발 정류장 값을 먼저 모두 읽은 뒤 기록 (같은 배치 안 덮어쓰기 방지)
+        trip, route = labels.trip[src], labels.route[src]
+        access_mode, boarding_time = labels.access_mode[src], labels.boarding_time[src]
+
+        labels.arrival_time[targets] = new_arrival[pick]
+        labels.transfers[targets] = new_transfers[pick]
+        labels.cost[targets] = new_cost[pick]
+        labels.parent_stop[targets] = src
+        labels.trip[targets] = trip
+        labels.route[targets] = route
+        labels.access_mode[targets] = access_mode
+        labels.round_number[targets] = round_num
+        labels.boarding_time[targets] = boarding_time
+        new_marked[targets] = True
     
-    def _is_label_better(self, new_arrival: int, new_transfers: int, new_cost: float,
-                        existing_label: Optional[RaptorLabel]) -> bool:
-        """레이블 개선 여부 판단 (Pareto 비교)"""
-        if existing_label is None:
-            return True
-        
+    def _is_label_better(self, new_arrival, new_transfers, new_cost,
+                        arrival, transfers, cost):
+        """레이블 개선 여부 판단 (Pareto 비교, 스칼라/배열 모두 가능)
+
+        미도달 정류장은 arrival=UNREACHED 이므로 항상 개선으로 판단된다.
+        """
         # 단순히 도착시간이 빠르면 좋음
-        if new_arrival < existing_label.arrival_time:
-            return True
-        
+        faster = new_arrival < arrival
+
         # 도착시간이 같으면 환승횟수와 비용 고려
-        if new_arrival == existing_label.arrival_time:
-            if new_transfers < existing_label.transfers:
-                return True
-            if new_transfers == existing_label.transfers and new_cost < existing_label.cost:
-                return True
-        
+        tie_better = (new_arrival == arrival) & (
+            (new_transfers < transfers) | ((new_transfers == transfers) & (new_cost < cost))
+        )
+
         # 도착시간이 5분 이내 차이면 환승이 적은 것 선호
-        if (new_arrival <= existing_label.arrival_time + 5 and 
-            new_transfers < existing_label.transfers):
-            return True
-        
-        return False
+        fewer_transfers = (new_arrival <= arrival + 5) & (new_transfers < transfers)
+
+        return faster | tie_better | fewer_transfers
     
     # =============================================================================
     # 유틸리티 함수들
@@ -1261,31 +1655,32 @@ class GangnamMultiModalRAPTOR:
     def _find_nearby_stops_from_point(self, lat: float, lon: float, 
                                      max_distance: float) -> List[Tuple[str, float]]:
         """특정 지점 근처 정류장 찾기"""
-        nearby = []
-        
-        for stop_id, stop in self.stops.items():
-            distance = self._haversine_distance(lat, lon, stop.stop_lat, stop.stop_lon)
-            if distance <= max_distance:
-                nearby.append((stop_id, distance))
-        
-        return sorted(nearby, key=lambda x: x[1])
-    
+        return self._nearby_within(lat, lon, max_distance, self._stop_keys,
+                                   self._stop_lat_rad, self._stop_lon_rad, self._stop_cos_lat)
+
     def _find_nearby_bike_stations(self, lat: float, lon: float,
                                   max_distance: float) -> List[Tuple[str, float]]:
         """근처 따릉이 대여소 찾기"""
-        nearby = []
-        
-        for station_id, station in self.bike_stations.items():
-            distance = self._haversine_distance(lat, lon, station.lat, station.lon)
-            if distance <= max_distance:
-                nearby.append((station_id, distance))
-        
-        return sorted(nearby, key=lambda x: x[1])
+        return self._nearby_within(lat, lon, max_distance, self._bike_keys,
+                                   self._bike_lat_rad, self._bike_lon_rad, self._bike_cos_lat)
+
+    def _nearby_within(self, lat: float, lon: float, max_distance: float, keys: List[str],
+                       lats_rad: np.ndarray, lons_rad: np.ndarray,
+                       cos_lats: np.ndarray) -> List[Tuple[str, float]]:
+        """반경 내 지점들을 거리순으로 반환 (일괄 하버사인)"""
+        if not keys:
+            return []
+
+        distances = haversine_vec(lat, lon, lats_rad, lons_rad, cos_lats)
+        idx = np.flatnonzero(distances <= max_distance)
+        idx = idx[np.argsort(distances[idx], kind='stable')]
+
+        return list(zip([keys[i] for i in idx.tolist()], distances[idx].tolist()))
     
     def _calculate_road_route(self, start_lat: float, start_lon: float,
                              end_lat: float, end_lon: float,
-                             mode: str) -> Tuple[float, float, List[Tuple[float, float]]]:
-        """실제 도로망 기반 경로 계산"""
+                             mode: str) -> Tuple[float, float, np.ndarray]:
+        """실제 도로망 기반 경로 계산 (좌표는 (N, 2) float64 [lat, lon])"""
         
         if self.road_graph is None:
             # 그래프가 없으면 직선거리 * 보정계수
@@ -1297,40 +1692,18 @@ class GangnamMultiModalRAPTOR:
             else:  # bike
                 time_minutes = (road_distance / self.BIKE_SPEED) * 60
             
-            coordinates = [(start_lat, start_lon), (end_lat, end_lon)]
+            coordinates = coords_array([(start_lat, start_lon), (end_lat, end_lon)])
             return time_minutes, road_distance, coordinates
         
         # 실제 그래프 사용
-        try:
-            # 가장 가까운 노드 찾기
-            start_node = self._find_nearest_node(start_lat, start_lon)
-            end_node = self._find_nearest_node(end_lat, end_lon)
-            
-            if start_node and end_node:
-                # 최단 경로 계산
-                if mode == 'walk':
-                    path = nx.shortest_path(self.road_graph, start_node, end_node, 
-                                          weight='walk_time')
-                    time_minutes = nx.shortest_path_length(self.road_graph, start_node, end_node,
-                                                         weight='walk_time')
-                else:  # bike
-                    path = nx.shortest_path(self.road_graph, start_node, end_node,
-                                          weight='bike_time')
-                    time_minutes = nx.shortest_path_length(self.road_graph, start_node, end_node,
-                                                         weight='bike_time')
-                
-                # 실제 거리 계산
-                total_distance = 0
-                for i in range(len(path) - 1):
-                    edge_data = self.road_graph.get_edge_data(path[i], path[i+1])
-                    if edge_data and 'distance' in edge_data:
-                        total_distance += edge_data['distance']
-                
-                coordinates = [(lat, lon) for lat, lon in path]
-                return time_minutes, total_distance, coordinates
-        
-        except (nx.NetworkXNoPath, nx.NodeNotFound):
-            pass
+        start_node = self._find_nearest_node(start_lat, start_lon)
+        end_node = self._find_nearest_node(end_lat, end_lon)
+
+        if start_node and end_node:
+            # 최단 경로 계산 (노드 쌍 단위 캐시)
+            cached = self._shortest_road_path(start_node, end_node, mode)
+            if cached is not None:
+                return cached
         
         # 실패시 직선거리 사용
         distance = self._haversine_distance(start_lat, start_lon, end_lat, end_lon)
@@ -1341,29 +1714,76 @@ class GangnamMultiModalRAPTOR:
         else:
             time_minutes = (road_distance / self.BIKE_SPEED) * 60
         
-        coordinates = [(start_lat, start_lon), (end_lat, end_lon)]
+        coordinates = coords_array([(start_lat, start_lon), (end_lat, end_lon)])
         return time_minutes, road_distance, coordinates
     
+    def _compute_shortest_road_path(self, start_node: Tuple[float, float],
+                                    end_node: Tuple[float, float],
+                                    mode: str) -> Optional[Tuple[float, float, np.ndarray]]:
+        """노드 쌍 최단 경로 (시간, 거리, 좌표) - 경로가 없으면 None
+
+        좌표 배열은 캐시에서 여러 경로가 공유하므로 읽기 전용으로 반환
+        """
+        if mode in self._road_matrices:
+            result = self._shortest_path_csr(start_node, end_node, mode)
+            if result is None:
+                return None
+            time_minutes, path = result
+        else:
+            # SciPy가 없으면 NetworkX 사용
+            weight = 'walk_time' if mode == 'walk' else 'bike_time'
+            try:
+                time_minutes, path = nx.single_source_dijkstra(
+                    self.road_graph, start_node, end_node, weight=weight
+                )
+            except (nx.NetworkXNoPath, nx.NodeNotFound):
+                return None
+
+        # 실제 거리 계산
+        total_distance = 0
+        for i in range(len(path) - 1):
+            edge_data = self.road_graph.get_edge_data(path[i], path[i+1])
+            if edge_data and 'distance' in edge_data:
+                total_distance += edge_data['distance']
+
+        coordinates = coords_array(path)
+        coordinates.flags.writeable = False
+        return time_minutes, total_distance, coordinates
+
+    def _shortest_path_csr(self, start_node: Tuple[float, float], end_node: Tuple[float, float],
+                           mode: str) -> Optional[Tuple[float, List[Tuple[float, float]]]]:
+        """CSR 행렬 위에서 SciPy Dijkstra로 최단 경로 계산"""
+        start_idx = self._road_node_index.get(start_node)
+        end_idx = self._road_node_index.get(end_node)
+        if start_idx is None or end_idx is None:
+            return None
+
+        dist, predecessors = self._road_sssp(start_idx, mode)
+        if not np.isfinite(dist[end_idx]):
+            return None
+
+        # predecessor를 따라 경로 복원
+        path_idx = [end_idx]
+        while path_idx[-1] != start_idx:
+            path_idx.append(int(predecessors[path_idx[-1]]))
+        path_idx.reverse()
+
+        return float(dist[end_idx]), [self._road_nodes[i] for i in path_idx]
+
+    def _compute_road_sssp(self, start_idx: int, mode: str) -> Tuple[np.ndarray, np.ndarray]:
+        """출발 노드 기준 전체 최단거리/선행노드 (같은 출발지의 여러 목적지 재사용)"""
+        return csgraph_dijkstra(self._road_matrices[mode], directed=True,
+                                indices=start_idx, return_predecessors=True)
+
     def _find_nearest_node(self, lat: float, lon: float) -> Optional[Tuple[float, float]]:
         """가장 가까운 그래프 노드 찾기"""
-        if not self.road_graph:
+        if not self.road_graph or not self._road_nodes:
             return None
-        
-        min_distance = float('inf')
-        nearest_node = None
-        
-        # 샘플링으로 성능 최적화
-        nodes = list(self.road_graph.nodes())
-        sample_size = min(1000, len(nodes))
-        sample_nodes = nodes[::len(nodes)//sample_size] if len(nodes) > sample_size else nodes
-        
-        for node in sample_nodes:
-            distance = self._haversine_distance(lat, lon, node[0], node[1])
-            if distance < min_distance:
-                min_distance = distance
-                nearest_node = node
-        
-        return nearest_node
+
+        # 전체 노드 대상 일괄 거리 계산 (샘플링 불필요)
+        distances = haversine_vec(lat, lon, self._node_lat_rad, self._node_lon_rad,
+                                  self._node_cos_lat)
+        return self._road_nodes[int(np.argmin(distances))]
     
     def _calculate_bike_cost(self, bike_time_minutes: float) -> float:
         """따릉이 요금 계산"""
@@ -1372,7 +1792,7 @@ class GangnamMultiModalRAPTOR:
         else:
             extra_time = bike_time_minutes - 30
             extra_periods = math.ceil(extra_time / 30)
-            return self.BIKE_BASE_FARE + (extra_periods * 1000)
+            return self.BIKE_BASE_FARE + (extra_periods * BIKE_EXTRA_FARE)
     
     def _find_simple_transit_route(self, origin_stop_id: str, dest_lat: float, dest_lon: float,
                                   departure_time: int) -> List[Dict]:
@@ -1393,7 +1813,7 @@ class GangnamMultiModalRAPTOR:
             egress_time = (dest_distance / self.WALK_SPEED) * 60
             
             # 간단한 최단경로 (직접 연결 또는 1회 환승)
-            routes = self._find_direct_routes(origin_stop_id, dest_stop_id)
+            routes = self._find_direct_routes(origin_stop_id, dest_stop_id, departure_time)
             
             for route_info in routes:
                 if route_info['arrival_time'] >= departure_time:
@@ -1414,7 +1834,8 @@ class GangnamMultiModalRAPTOR:
         
         return sorted(results, key=lambda x: x['duration'])[:3]
     
-    def _find_direct_routes(self, origin_stop_id: str, dest_stop_id: str) -> List[Dict]:
+    def _find_direct_routes(self, origin_stop_id: str, dest_stop_id: str,
+                            departure_time: int) -> List[Dict]:
         """두 정류장간 직접 연결 노선 찾기"""
         routes = []
         
@@ -1428,27 +1849,27 @@ class GangnamMultiModalRAPTOR:
             if route_id in self.routes:
                 route = self.routes[route_id]
                 
-                # 노선 패턴에서 순서 확인
-                try:
-                    origin_idx = route.stop_pattern.index(origin_stop_id)
-                    dest_idx = route.stop_pattern.index(dest_stop_id)
-                    
-                    if dest_idx > origin_idx:  # 올바른 방향
-                        # 예상 소요시간 (역 수 * 2분)
-                        station_count = dest_idx - origin_idx
-                        estimated_time = station_count * 2
-                        
-                        routes.append({
-                            'route_id': route_id,
-                            'route_name': route.route_name,
-                            'route_color': route.route_color,
-                            'transfers': 0,
-                            'cost': route.base_fare,
-                            'arrival_time': int(time.time() / 60) + estimated_time,  # 임시
-                            'distance': station_count * 0.8  # 역간 평균 거리 추정
-                        })
-                except ValueError:
+                # 노선 패턴에서 순서 확인 (정류장 → 첫 위치 사전)
+                stop_positions = self._route_stop_positions[route_id]
+                origin_idx = stop_positions.get(origin_stop_id)
+                dest_idx = stop_positions.get(dest_stop_id)
+                if origin_idx is None or dest_idx is None:
                     continue
+                
+                if dest_idx > origin_idx:  # 올바른 방향
+                    # 예상 소요시간 (역 수 * 2분)
+                    station_count = dest_idx - origin_idx
+                    estimated_time = station_count * 2
+                    
+                    routes.append({
+                        'route_id': route_id,
+                        'route_name': route.route_name,
+                        'route_color': route.route_color,
+                        'transfers': 0,
+                        'cost': route.base_fare,
+                        'arrival_time': departure_time + estimated_time,
+                        'distance': station_count * 0.8  # 역간 평균 거리 추정
+                    })
         
         return routes
     
@@ -1535,7 +1956,7 @@ class GangnamMultiModalRAPTOR:
             departure_time=dep_time,
             arrival_time=dep_time + max(10, total_time),
             journey_type="transit",
-            route_coordinates=coordinates,
+            route_coordinates=coords_array(coordinates),
             segments=segments
         )
     
@@ -1548,24 +1969,15 @@ class GangnamMultiModalRAPTOR:
         
         # 지하철 노선명 정리
         if route.route_type == 1:  # 지하철
-            if '2' in route_name or '2호선' in route_name:
-                return "지하철 2호선"
-            elif '7' in route_name or '7호선' in route_name:
-                return "지하철 7호선"
-            elif '9' in route_name or '9호선' in route_name:
-                return "지하철 9호선"
-            elif '분당' in route_name:
-                return "분당선"
-            elif '신분당' in route_name:
-                return "신분당선"
-            else:
-                return f"지하철 {route_name}"
+            for pattern, clean_name in _SUBWAY_MAP:
+                if pattern.search(route_name):
+                    return clean_name
+            return f"지하철 {route_name}"
         else:  # 버스
-            # 숫자만 추출
-            import re
-            numbers = re.findall(r'\d+', route_name)
-            if numbers:
-                return f"{numbers[0]}번 버스"
+            # 첫 번째 숫자만 추출
+            match = _BUS_NUM_RE.search(route_name)
+            if match:
+                return f"{match.group()}번 버스"
             else:
                 return f"{route_name} 버스"
     
@@ -1580,209 +1992,175 @@ class GangnamMultiModalRAPTOR:
         
         print(f"     ⚖️ Pareto 최적화: {len(journeys)}개 경로 입력")
         
-        # 1. 교통수단별 그룹화
-        groups = {
-            'walk': [],
-            'bike': [],
-            'transit': [],
-            'mixed': []
-        }
-        
-        for journey in journeys:
-            groups[journey.journey_type].append(journey)
+        # 가중치는 호출 단위로 고정되므로 한 번만 조회
+        time_weight = float(preferences.get('time_weight', 0.5))
+        cost_weight = float(preferences.get('cost_weight', 0.2))
+        transfer_weight = float(preferences.get('transfer_weight', 0.3))
         
-        pareto_optimal = []
+        batch = JourneyBatch.from_journeys(journeys)
+        criteria = np.column_stack([batch.times, batch.costs, batch.transfers.astype(np.float32)])
         
-        # 2. 각 그룹에서 Pareto 최적 선택
-        for group_type, group_journeys in groups.items():
-            if not group_journeys:
+        # 1~2. 교통수단별 그룹에서 Pareto front 선택 (시간/비용/환승 지배 관계 일괄 계산)
+        pareto_idx = []
+        for code in range(len(JOURNEY_TYPES)):
+            group_idx = np.flatnonzero(batch.types == code)
+            if len(group_idx) == 0:
                 continue
             
-            # 시간 기준 최고
-            best_time = min(group_journeys, key=lambda x: x.total_time)
-            pareto_optimal.append(best_time)
-            
-            # 비용 기준 최고 (다른 경로인 경우)
-            best_cost = min(group_journeys, key=lambda x: x.total_cost)
-            if best_cost != best_time:
-                pareto_optimal.append(best_cost)
-            
-            # 환승 기준 최고 (다른 경로인 경우)
-            best_transfer = min(group_journeys, key=lambda x: x.total_transfers)
-            if best_transfer not in [best_time, best_cost]:
-                pareto_optimal.append(best_transfer)
-        
-        # 3. 중복 제거
-        unique_journeys = []
-        for journey in pareto_optimal:
-            is_duplicate = False
-            for existing in unique_journeys:
-                if self._are_journeys_similar(journey, existing):
-                    is_duplicate = True
-                    break
-            if not is_duplicate:
-                unique_journeys.append(journey)
-        
-        # 4. 다중기준 점수 계산
-        for journey in unique_journeys:
-            journey.pareto_rank = self._calculate_multi_criteria_score(journey, preferences)
-        
-        print(f"     ✅ Pareto 결과: {len(unique_journeys)}개 경로")
-        return sorted(unique_journeys, key=lambda x: x.pareto_rank)
+            pareto_idx.append(group_idx[_pareto_mask(criteria[group_idx])])
+        
+        batch = batch.take(np.concatenate(pareto_idx))
+        
+        # 3. 중복 제거 (교통수단, 시간 5분/비용 200원 버킷, 환승이 같으면 첫 경로만)
+        keys = np.column_stack([
+            batch.types.astype(np.int64),
+            np.floor_divide(batch.times, 5).astype(np.int64),
+            np.floor_divide(batch.costs, 200).astype(np.int64),
+            batch.transfers.astype(np.int64)
+        ])
+        _, first_idx = np.unique(keys, axis=0, return_index=True)
+        batch = batch.take(np.sort(first_idx))
+        
+        # 4. 다중기준 점수 계산 (일괄) 후 점수순 정렬
+        batch.ranks = self._calculate_multi_criteria_scores(batch, time_weight, cost_weight, transfer_weight)
+        batch = batch.take(np.argsort(batch.ranks, kind='stable'))
+        
+        print(f"     ✅ Pareto 결과: {len(batch.payload)}개 경로")
+        return batch.to_journeys()
     
-    def _are_journeys_similar(self, journey1: Journey, journey2: Journey) -> bool:
-        """두 경로가 유사한지 판단"""
-        time_diff = abs(journey1.total_time - journey2.total_time)
-        cost_diff = abs(journey1.total_cost - journey2.total_cost)
-        transfer_diff = abs(journey1.total_transfers - journey2.total_transfers)
-        
-        return (time_diff <= 5 and cost_diff <= 200 and transfer_diff <= 1 and
-                journey1.journey_type == journey2.journey_type)
-    
-    def _calculate_multi_criteria_score(self, journey: Journey, preferences: Dict) -> float:
-        """다중기준 점수 계산 (낮을수록 좋음)"""
-        time_weight = preferences.get('time_weight', 0.5)
-        cost_weight = preferences.get('cost_weight', 0.2)
-        transfer_weight = preferences.get('transfer_weight', 0.3)
-        
-        # 정규화를 위한 기준값
-        max_time = 60  # 60분
-        max_cost = 3000  # 3000원
-        max_transfers = 3  # 3회
-        
-        time_score = min(journey.total_time / max_time, 1.0)
-        cost_score = min(journey.total_cost / max_cost, 1.0)
-        transfer_score = min(journey.total_transfers / max_transfers, 1.0)
-        
-        total_score = (time_score * time_weight + 
-                      cost_score * cost_weight + 
-                      transfer_score * transfer_weight)
-        
-        return total_score
+    def _calculate_multi_criteria_scores(self, batch: JourneyBatch, time_weight: float,
+                                         cost_weight: float, transfer_weight: float) -> np.ndarray:
+        """다중기준 점수 일괄 계산 (낮을수록 좋음)"""
+        return _score_kernel(
+            batch.times.astype(np.float64),
+            batch.costs.astype(np.float64),
+            batch.transfers.astype(np.float64),
+            time_weight, cost_weight, transfer_weight
+        )
     
     def _diversify_routes(self, journeys: List[Journey], max_routes: int) -> List[Journey]:
         """경로 다양성 확보"""
         if len(journeys) <= max_routes:
             return journeys
         
-        diversified = []
+        batch = JourneyBatch.from_journeys(journeys)
         
-        # 1. 각 교통수단별 최고 경로 보장
-        type_best = {}
-        for journey in journeys:
-            if journey.journey_type not in type_best:
-                type_best[journey.journey_type] = journey
-            elif journey.pareto_rank < type_best[journey.journey_type].pareto_rank:
-                type_best[journey.journey_type] = journey
+        # 점수순으로 한 번만 정렬한 뒤 그 순서 위치에서 선택
+        order = np.argsort(batch.ranks, kind='stable')
+        selected = np.zeros(len(journeys), dtype=bool)
         
-        diversified.extend(type_best.values())
+        # 1. 각 교통수단별 최고 경로 보장 (정렬 순서에서 유형별 첫 경로)
+        _, first_pos = np.unique(batch.types[order], return_index=True)
+        selected[first_pos] = True
         
         # 2. 나머지 슬롯을 점수순으로 채움
-        remaining_slots = max_routes - len(diversified)
-        remaining_journeys = [j for j in journeys if j not in diversified]
+        fillers = np.flatnonzero(~selected)[:max(max_routes - len(first_pos), 0)]
+        selected[fillers] = True
         
-        diversified.extend(remaining_journeys[:remaining_slots])
-        
-        return sorted(diversified, key=lambda x: x.pareto_rank)
+        return [batch.payload[i] for i in order[selected].tolist()]
     
     # =============================================================================
     # 결과 출력 및 시각화 준비
     # =============================================================================
     
     def print_journey_summary(self, journeys: List[Journey]):
-        """경로 요약 출력"""
+        """경로 요약 출력 (한 번에 모아서 출력)"""
         if not journeys:
             print("❌ 경로를 찾을 수 없습니다.")
             return
         
-        print(f"\n🎉 총 {len(journeys)}개 최적 경로:")
-        print("=" * 80)
+        transport_emoji = self._TRANSPORT_EMOJI
+        mode_emoji = self._MODE_EMOJI
+        buf = io.StringIO()
+        w = buf.write
+        w(f"\n🎉 총 {len(journeys)}개 최적 경로:\n")
+        w("=" * 80 + "\n")
         
         for i, journey in enumerate(journeys, 1):
-            print(f"\n{'='*20} 경로 {i} ({'⭐' * min(3, 4-journey.pareto_rank)}) {'='*20}")
-            print(f"🚶‍♂️ 교통수단: {self._get_transport_emoji(journey.journey_type)} {journey.journey_type.upper()}")
-            print(f"⏱️  총 소요시간: {journey.total_time//60}시간 {journey.total_time%60}분")
-            print(f"💰 총 요금: {journey.total_cost:,.0f}원")
-            print(f"🔄 환승횟수: {journey.total_transfers}회")
-            print(f"📏 총 거리: {journey.total_distance:.1f}km")
-            print(f"🕐 출발: {self._minutes_to_time(journey.departure_time)} → 도착: {self._minutes_to_time(journey.arrival_time)}")
+            w(f"\n{'='*20} 경로 {i} ({'⭐' * min(3, 4-journey.pareto_rank)}) {'='*20}\n")
+            w(f"🚶‍♂️ 교통수단: {transport_emoji.get(journey.journey_type, '🚌')} {journey.journey_type.upper()}\n")
+            w(f"⏱️  총 소요시간: {journey.total_time//60}시간 {journey.total_time%60}분\n")
+            w(f"💰 총 요금: {journey.total_cost:,.0f}원\n")
+            w(f"🔄 환승횟수: {journey.total_transfers}회\n")
+            w(f"📏 총 거리: {journey.total_distance:.1f}km\n")
+            w(f"🕐 출발: {self._minutes_to_time(journey.departure_time)} → 도착: {self._minutes_to_time(journey.arrival_time)}\n")
             
-            print(f"\n📍 상세 경로:")
+            w(f"\n📍 상세 경로:\n")
             for j, segment in enumerate(journey.segments, 1):
-                duration_str = f"{segment['duration']}분"
-                cost_str = f" ({segment.get('cost', 0):,.0f}원)" if segment.get('cost', 0) > 0 else ""
-                distance_str = f" {segment.get('distance_km', 0):.1f}km" if segment.get('distance_km', 0) > 0 else ""
+                cost = segment.get('cost', 0)
+                distance = segment.get('distance_km', 0)
+                cost_str = f" ({cost:,.0f}원)" if cost > 0 else ""
+                distance_str = f" {distance:.1f}km" if distance > 0 else ""
                 
-                mode_emoji = self._get_mode_emoji(segment['mode'])
-                print(f"  {j}. {mode_emoji} {segment['route_info']}: {segment['from']} → {segment['to']}")
-                print(f"     소요시간: {duration_str}{cost_str}{distance_str}")
+                w(f"  {j}. {mode_emoji.get(segment['mode'], '🚌')} {segment['route_info']}: {segment['from']} → {segment['to']}\n")
+                w(f"     소요시간: {segment['duration']}분{cost_str}{distance_str}\n")
             
-            print("-" * 80)
+            w("-" * 80 + "\n")
+        
+        sys.stdout.write(buf.getvalue())
     
     def _get_transport_emoji(self, journey_type: str) -> str:
         """교통수단 이모지"""
-        emoji_map = {
-            'walk': '🚶‍♂️',
-            'bike': '🚲',
-            'transit': '🚇',
-            'mixed': '🔄'
-        }
-        return emoji_map.get(journey_type, '🚌')
+        return self._TRANSPORT_EMOJI.get(journey_type, '🚌')
     
     def _get_mode_emoji(self, mode: str) -> str:
         """이동수단 이모지"""
-        emoji_map = {
-            'walk': '🚶‍♂️',
-            'bike': '🚲',
-            'bike_rental': '🔄',
-            'bike_return': '🔄',
-            'transit': '🚇',
-            'bus': '🚌',
-            'subway': '🚇'
-        }
-        return emoji_map.get(mode, '🚌')
+        return self._MODE_EMOJI.get(mode, '🚌')
     
     def _minutes_to_time(self, minutes: int) -> str:
-        """분을 시간 문자열로 변환"""
-        hours = minutes // 60
-        mins = minutes % 60
-        return f"{hours:02d}:{mins:02d}"
+        """분을 시간 문자열로 변환 (자정 이후 24시+ 표기는 직접 계산)"""
+        if 0 <= minutes < 1440:
+            return _MIN_TO_TIME[minutes]
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
     
     def get_journey_geojson(self, journeys: List[Journey]) -> Dict:
         """경로를 GeoJSON 형식으로 변환 (시각화용)"""
-        features = []
-        
-        colors = ['#FF0000', '#0000FF', '#00FF00', '#FF8000', '#8000FF']
+        return {
+            "type": "FeatureCollection",
+            "features": list(self._iter_geojson_features(journeys))
+        }
+    
+    _GEOJSON_COLORS = ('#FF0000', '#0000FF', '#00FF00', '#FF8000', '#8000FF')
+    
+    def _line_feature(self, journey_id: int, journey: Journey, color: str) -> Dict:
+        """경로 전체 LineString feature"""
+        return {
+            "type": "Feature",
+            "properties": {
+                "journey_id": journey_id,
+                "journey_type": journey.journey_type,
+                "total_time": journey.total_time,
+                "total_cost": journey.total_cost,
+                "total_transfers": journey.total_transfers,
+                "color": color,
+                "weight": 5,
+                "opacity": 0.8
+            },
+            "geometry": {
+                "type": "LineString",
+                "coordinates": journey.route_coordinates[:, ::-1].tolist()
+            }
+        }
+    
+    def _iter_geojson_features(self, journeys: List[Journey]):
+        """GeoJSON feature를 하나씩 생성"""
+        colors = self._GEOJSON_COLORS
         
         for i, journey in enumerate(journeys):
             color = colors[i % len(colors)]
             
-            if journey.route_coordinates and len(journey.route_coordinates) > 1:
+            if len(journey.route_coordinates) > 1:
                 # 경로 라인
-                line_feature = {
-                    "type": "Feature",
-                    "properties": {
-                        "journey_id": i + 1,
-                        "journey_type": journey.journey_type,
-                        "total_time": journey.total_time,
-                        "total_cost": journey.total_cost,
-                        "total_transfers": journey.total_transfers,
-                        "color": color,
-                        "weight": 5,
-                        "opacity": 0.8
-                    },
-                    "geometry": {
-                        "type": "LineString",
-                        "coordinates": [[lon, lat] for lat, lon in journey.route_coordinates]
-                    }
-                }
-                features.append(line_feature)
+                yield self._line_feature(i + 1, journey, color)
             
             # 세그먼트별 포인트들
             for j, segment in enumerate(journey.segments):
-                if 'coordinates' in segment and segment['coordinates']:
-                    for k, (lat, lon) in enumerate(segment['coordinates']):
-                        point_feature = {
+                if 'coordinates' in segment and len(segment['coordinates']):
+                    # [lat, lon] → [lon, lat] 일괄 변환 후 행 단위 순회
+                    lonlats = np.asarray(segment['coordinates'], dtype=np.float64)[:, ::-1].tolist()
+                    last = len(lonlats) - 1
+                    for k, lonlat in enumerate(lonlats):
+                        yield {
                             "type": "Feature",
                             "properties": {
                                 "journey_id": i + 1,
@@ -1791,19 +2169,36 @@ class GangnamMultiModalRAPTOR:
                                 "mode": segment['mode'],
                                 "route_info": segment.get('route_info', ''),
                                 "marker_color": color,
-                                "marker_size": "small" if k > 0 and k < len(segment['coordinates'])-1 else "medium"
+                                "marker_size": "small" if 0 < k < last else "medium"
                             },
                             "geometry": {
                                 "type": "Point",
-                                "coordinates": [lon, lat]
+                                "coordinates": lonlat
                             }
                         }
-                        features.append(point_feature)
+    
+    def _iter_geojson_feature_strings(self, journeys: List[Journey]):
+        """GeoJSON feature를 JSON 문자열로 생성 (저장용, 포인트는 템플릿으로 직접 렌더링)"""
+        colors = self._GEOJSON_COLORS
         
-        return {
-            "type": "FeatureCollection",
-            "features": features
-        }
+        for i, journey in enumerate(journeys):
+            color = colors[i % len(colors)]
+            
+            if len(journey.route_coordinates) > 1:
+                yield json_bytes(self._line_feature(i + 1, journey, color)).decode('utf-8')
+            
+            for j, segment in enumerate(journey.segments):
+                if 'coordinates' in segment and len(segment['coordinates']):
+                    # 세그먼트 공통 문자열 값은 한 번만 이스케이프
+                    mode = json.dumps(segment['mode'], ensure_ascii=False)
+                    route_info = json.dumps(segment.get('route_info', ''), ensure_ascii=False)
+                    latlons = np.asarray(segment['coordinates'], dtype=np.float64).tolist()
+                    last = len(latlons) - 1
+                    for k, (lat, lon) in enumerate(latlons):
+                        yield _POINT_FEATURE_TMPL.format(
+                            jid=i + 1, sid=j, pid=k, mode=mode, ri=route_info, color=color,
+                            size="small" if 0 < k < last else "medium", lon=lon, lat=lat
+                        )
     
     def save_results(self, journeys: List[Journey], output_path: str):
         """결과 저장"""
@@ -1828,28 +2223,28 @@ class GangnamMultiModalRAPTOR:
             }
             results_data.append(journey_data)
         
-        with open(output_dir / 'journey_results.json', 'w', encoding='utf-8') as f:
-            json.dump(results_data, f, indent=2, ensure_ascii=False)
+        with open(output_dir / 'journey_results.json', 'wb') as f:
+            f.write(json_bytes(results_data, indent=True))
         
-        # 2. GeoJSON 저장
-        geojson_data = self.get_journey_geojson(journeys)
-        with open(output_dir / 'journey_routes.geojson', 'w', encoding='utf-8') as f:
-            json.dump(geojson_data, f, indent=2)
+        # 2. GeoJSON 저장 (feature 문자열을 이어 붙여 한 번에 기록)
+        with open(output_dir / 'journey_routes.geojson', 'wb') as f:
+            f.write(b'{"type":"FeatureCollection","features":[')
+            f.write(','.join(self._iter_geojson_feature_strings(journeys)).encode('utf-8'))
+            f.write(b']}')
         
-        # 3. 요약 통계 저장
+        # 3. 요약 통계 저장 (SoA 배열에서 한 번에 집계)
+        batch = JourneyBatch.from_journeys(journeys)
+        type_counts = np.bincount(batch.types, minlength=len(JOURNEY_TYPES)).tolist()
         summary = {
             'total_journeys': len(journeys),
-            'journey_types': {
-                journey_type: sum(1 for j in journeys if j.journey_type == journey_type)
-                for journey_type in ['walk', 'bike', 'transit', 'mixed']
-            },
-            'avg_time': sum(j.total_time for j in journeys) / len(journeys) if journeys else 0,
-            'avg_cost': sum(j.total_cost for j in journeys) / len(journeys) if journeys else 0,
-            'avg_transfers': sum(j.total_transfers for j in journeys) / len(journeys) if journeys else 0
+            'journey_types': dict(zip(JOURNEY_TYPES, type_counts)),
+            'avg_time': float(batch.times.mean(dtype=np.float64)) if journeys else 0,
+            'avg_cost': float(batch.costs.mean(dtype=np.float64)) if journeys else 0,
+            'avg_transfers': float(batch.transfers.mean(dtype=np.float64)) if journeys else 0
         }
         
-        with open(output_dir / 'summary.json', 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        with open(output_dir / 'summary.json', 'wb') as f:
+            f.write(json_bytes(summary, indent=True))
         
         print(f"✅ 결과 저장 완료: {output_dir}/")
 
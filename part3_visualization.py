@@ -7,49 +7,583 @@ Part 3-1: 강남구 Multi-modal RAPTOR 경로 시각화 엔진 v1.0 (핵심 부
 - 대화형 웹 지도 인터페이스
 """
 
-import geopandas as gpd
+from __future__ import annotations
+
 import pandas as pd
 import numpy as np
-import folium
-import folium.plugins as plugins
-import plotly.graph_objects as go
-import plotly.express as px
-import networkx as nx
 import json
-import pickle
-import requests
+import importlib.util
+import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Iterator, TYPE_CHECKING
 import warnings
-from datetime import datetime, timedelta
-import base64
-from io import BytesIO
-import time
+from datetime import datetime
 from dataclasses import dataclass
+from functools import lru_cache
 import math
+import bisect
+
+from raptor_utils import coords_array, json_bytes
+
+# folium / plotly / networkx는 실제로 사용하는 메서드에서 지연 import
+if TYPE_CHECKING:
+    import folium
+    import plotly.graph_objects as go
+
+# pyarrow는 CSV 파서 엔진으로만 쓰므로 설치 여부만 확인
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# SciPy / scikit-learn은 import 비용이 커서 설치 여부만 확인하고 처음 사용할 때 import
+SCIPY_AVAILABLE = importlib.util.find_spec('scipy') is not None
+
+try:
+    import numexpr
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+SKLEARN_AVAILABLE = importlib.util.find_spec('sklearn') is not None
+
+# shapely는 폴리라인 단순화에만 쓰므로 설치 여부만 확인 (없으면 단순화 생략)
+SHAPELY_AVAILABLE = importlib.util.find_spec('shapely') is not None
 
 warnings.filterwarnings('ignore')
 
+def _read_tabular(csv_path: Path) -> pd.DataFrame:
+    """CSV 로드 (pyarrow가 있으면 pyarrow CSV 엔진, 없으면 기본 파서)"""
+    if PYARROW_AVAILABLE:
+        return pd.read_csv(csv_path, encoding='utf-8', engine='pyarrow')
+    return pd.read_csv(csv_path, encoding='utf-8')
+
+def _encode_polyline(coordinates, precision: int = 5) -> str:
+    """좌표 목록을 Google encoded polyline 문자열로 변환"""
+    points = np.round(np.asarray(coordinates, dtype=np.float64).reshape(-1, 2) * 10 ** precision).astype(np.int64)
+    deltas = np.diff(points, axis=0, prepend=np.zeros((1, 2), dtype=np.int64)).ravel()
+    # 부호 비트를 최하위로 (음수는 비트 반전)
+    values = ((deltas << 1) ^ (deltas >> 63)).tolist()
+    
+    chars = []
+    for value in values:
+        while value >= 0x20:
+            chars.append(chr((0x20 | (value & 0x1f)) + 63))
+            value >>= 5
+        chars.append(chr(value + 63))
+    return ''.join(chars)
+
+def _simplify_coordinates(coordinates, tolerance: float) -> np.ndarray:
+    """Ramer-Douglas-Peucker로 폴리라인 정점 축소 (시작/끝점은 유지, shapely가 없으면 그대로 반환)"""
+    if not SHAPELY_AVAILABLE:
+        return coords_array(coordinates)
+    import shapely
+    line = shapely.linestrings(coords_array(coordinates))
+    simplified = shapely.simplify(line, tolerance, preserve_topology=False)
+    return shapely.get_coordinates(simplified)
+
+# 브라우저에서 encoded polyline을 좌표 배열로 복원 (지도당 한 번 삽입)
+_POLYLINE_DECODER_JS = """
+<script>
+function decodePolyline(str, precision) {
+    var index = 0, lat = 0, lng = 0, coords = [], factor = Math.pow(10, precision || 5);
+    while (index < str.length) {
+        var shift = 0, result = 0, b;
+        do { b = str.charCodeAt(index++) - 63; result |= (b & 0x1f) << shift; shift += 5; } while (b >= 0x20);
+        lat += (result & 1) ? ~(result >> 1) : (result >> 1);
+        shift = 0; result = 0;
+        do { b = str.charCodeAt(index++) - 63; result |= (b & 0x1f) << shift; shift += 5; } while (b >= 0x20);
+        lng += (result & 1) ? ~(result >> 1) : (result >> 1);
+        coords.push([lat / factor, lng / factor]);
+    }
+    return coords;
+}
+</script>
+"""
+
+# 세그먼트 팝업 HTML을 클릭 시점에 생성 (지도당 한 번 삽입)
+_SEGMENT_POPUP_JS = """
+<script>
+function segmentPopupHtml(p) {
+    return '<div style="width: 250px; font-family: Arial, sans-serif;">' +
+        '<h4 style="margin: 0; color: ' + p.color + ';">' + p.icon + ' ' + p.route_name + '</h4>' +
+        '<hr style="margin: 5px 0;">' +
+        '<p style="margin: 5px 0;"><b>경로:</b> ' + p.journey_id + ', 구간: ' + p.segment_no + '</p>' +
+        '<p style="margin: 5px 0;"><b>소요시간:</b> ' + p.duration + '분</p>' +
+        '<p style="margin: 5px 0;"><b>거리:</b> ' + p.distance.toFixed(2) + 'km</p>' +
+        '<p style="margin: 5px 0;"><b>요금:</b> ' + Math.round(p.cost).toLocaleString('en-US') + '원</p>' +
+        '</div>';
+}
+</script>
+"""
+
+# 여행 타입 / 세그먼트 모드 / 결과 파일 종류별 아이콘 (없으면 호출부 기본값)
+_JOURNEY_TYPE_EMOJI = {
+    'walk': '🚶‍♂️',
+    'bike': '🚲', 
+    'transit': '🚇',
+    'mixed': '🔄'
+}
+
+_MODE_EMOJIS = {
+    'walk': '🚶‍♂️',
+    'bike': '🚲',
+    'transit': '🚇',
+    'bike_rental': '🔄',
+    'bike_return': '🔄'
+}
+
+_FILE_ICONS = {
+    'interactive_map': '🗺️',
+    'plotly_visualization': '📊',
+    'comparison_chart': '📈',
+    'static_image': '🖼️',
+    'statistics': '📋',
+    'geojson': '🌍',
+    'report': '📄'
+}
+
+@lru_cache(maxsize=4096)
+def _journey_row_strings(journey_type: str, total_time, total_cost: float,
+                         total_distance_km) -> Tuple[str, str, str, str]:
+    """여행 한 건의 표시 문자열 (타입 이모지, 시간, 요금, 거리) - 리포트/요약 출력 공용"""
+    return (_JOURNEY_TYPE_EMOJI.get(journey_type, '🚌'), f"{total_time}분",
+            f"{total_cost:,.0f}원", f"{total_distance_km}km")
+
+def _format_journey_row(journey: VisualizationJourney) -> Tuple[str, str, str, str]:
+    """VisualizationJourney → _journey_row_strings 캐시 조회"""
+    return _journey_row_strings(journey.journey_type, journey.total_time, journey.total_cost,
+                                journey.summary_stats['total_distance_km'])
+
+# 지하철 노선명 → 색상 판별 패턴 (color_schemes의 subway_2/7/9/신분당/분당 순서, 모듈 로드 시 한 번 컴파일)
+# 호선 번호는 앞뒤가 숫자가 아닐 때만 일치 ('22' 같은 이름이 2호선으로 잡히지 않도록)
+_SUBWAY_LINE_PATTERNS = (
+    re.compile(r'(?<!\d)2(?!\d)'),
+    re.compile(r'(?<!\d)7(?!\d)'),
+    re.compile(r'(?<!\d)9(?!\d)'),
+    re.compile('신분당|^D'),
+    re.compile('분당|^K')
+)
+
+# HTML 요약 리포트: 정적인 머리(<head>)와 꼬리(파일 목록/푸터)는 모듈 로드 시 UTF-8로 미리 인코딩,
+# 그 사이 본문만 Jinja2 템플릿으로 렌더링. 스타일은 리포트 옆 report_styles.css로 한 번만 기록
+# (리포트 HTML만 다른 곳으로 복사하면 스타일이 빠지므로 CSS 파일도 함께 옮겨야 함)
+_REPORT_CSS_BYTES = """\
+body { font-family: 'Malgun Gothic', Arial, sans-serif; margin: 40px; line-height: 1.6; }
+.header { text-align: center; margin-bottom: 40px; }
+.section { margin: 30px 0; padding: 20px; border: 1px solid #ddd; border-radius: 10px; }
+.journey { margin: 20px 0; padding: 15px; background: #f8f9fa; border-radius: 8px; }
+.segment { margin: 10px 0; padding: 10px; background: white; border-left: 4px solid #007bff; }
+.stats { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; }
+.stat-box { padding: 15px; background: #e9ecef; border-radius: 8px; text-align: center; }
+.emoji { font-size: 1.5em; margin-right: 10px; }
+table { width: 100%; border-collapse: collapse; margin: 20px 0; }
+th, td { padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }
+th { background-color: #f8f9fa; font-weight: bold; }
+""".encode('utf-8')
+
+_REPORT_HEAD_BYTES = """
+        <!DOCTYPE html>
+        <html lang="ko">
+        <head>
+            <meta charset="UTF-8">
+            <meta name="viewport" content="width=device-width, initial-scale=1.0">
+            <title>강남구 Multi-modal RAPTOR 경로 분석 리포트</title>
+            <link rel="stylesheet" href="report_styles.css">
+        </head>
+        <body>
+""".encode('utf-8')
+
+_REPORT_HTML = """\
+            <div class="header">
+                <h1>🗺️ 강남구 Multi-modal RAPTOR</h1>
+                <h2>경로 분석 리포트</h2>
+                <p>생성일시: {{ generated_at }}</p>
+            </div>
+            
+            <div class="section">
+                <h3>📊 전체 통계</h3>
+                <div class="stats">
+                    <div class="stat-box">
+                        <div><span class="emoji">🛣️</span><strong>총 경로 수</strong></div>
+                        <div style="font-size: 2em; color: #007bff;">{{ statistics.get('total_journeys', 0) }}</div>
+                    </div>
+                    <div class="stat-box">
+                        <div><span class="emoji">⏱️</span><strong>평균 소요시간</strong></div>
+                        <div style="font-size: 1.5em; color: #28a745;">{{ statistics.get('time_stats', {}).get('avg', 0)|fmt('.1f') }}분</div>
+                    </div>
+                    <div class="stat-box">
+                        <div><span class="emoji">💰</span><strong>평균 요금</strong></div>
+                        <div style="font-size: 1.5em; color: #ffc107;">{{ statistics.get('cost_stats', {}).get('avg', 0)|fmt('.0f') }}원</div>
+                    </div>
+                    <div class="stat-box">
+                        <div><span class="emoji">📏</span><strong>평균 거리</strong></div>
+                        <div style="font-size: 1.5em; color: #17a2b8;">{{ statistics.get('distance_stats', {}).get('avg', 0)|fmt('.1f') }}km</div>
+                    </div>
+                </div>
+            </div>
+            
+            <div class="section">
+                <h3>🚗 교통수단별 분석</h3>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>교통수단</th>
+                            <th>경로 수</th>
+                            <th>평균 시간</th>
+                            <th>평균 요금</th>
+                            <th>평균 거리</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                    {% for journey_type, type_stats in statistics.get('journey_types', {}).items() %}
+                        <tr>
+                            <td>{{ type_emoji_of(journey_type, '🚌') }} {{ journey_type|upper }}</td>
+                            <td>{{ type_stats['count'] }}개</td>
+                            <td>{{ type_stats['avg_time']|fmt('.1f') }}분</td>
+                            <td>{{ type_stats['avg_cost']|fmt('.0f') }}원</td>
+                            <td>{{ type_stats['avg_distance']|fmt('.1f') }}km</td>
+                        </tr>
+                    {% endfor %}
+                    </tbody>
+                </table>
+            </div>
+            
+            <div class="section">
+                <h3>🏆 효율성 순위</h3>
+                <table>
+                    <thead>
+                        <tr>
+                            <th>순위</th>
+                            <th>경로</th>
+                            <th>교통수단</th>
+                            <th>소요시간</th>
+                            <th>요금</th>
+                            <th>효율성 점수</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+                    {% for ranking in top_rankings %}
+                        <tr>
+                            <td>#{{ loop.index }}</td>
+                            <td>경로 {{ ranking['journey_id'] }}</td>
+                            <td>{{ type_emoji_of(ranking['journey_type'], '🚌') }} {{ ranking['journey_type']|upper }}</td>
+                            <td>{{ ranking['total_time'] }}분</td>
+                            <td>{{ ranking['total_cost']|fmt(',.0f') }}원</td>
+                            <td>{{ ranking['efficiency_score']|fmt('.2f') }}</td>
+                        </tr>
+                    {% endfor %}
+                    </tbody>
+                </table>
+            </div>
+            
+            <div class="section">
+                <h3>🗺️ 상세 경로 정보</h3>
+            {% for journey, (type_emoji, time_str, cost_str, distance_str) in journey_rows %}
+                <div class="journey">
+                    <h4>{{ type_emoji }} 경로 {{ journey.journey_id }} ({{ journey.journey_type|upper }})</h4>
+                    <p><strong>총 소요시간:</strong> {{ time_str }} | 
+                       <strong>총 요금:</strong> {{ cost_str }} | 
+                       <strong>총 거리:</strong> {{ distance_str }}</p>
+                    
+                    <h5>세부 구간:</h5>
+                {% for segment in journey.segments %}
+                    <div class="segment">
+                        <strong>{{ loop.index }}. {{ mode_emoji_of(segment.mode, '🚌') }} {{ segment.route_name }}</strong><br>
+                        소요시간: {{ segment.duration }}분 | 거리: {{ segment.distance|fmt('.2f') }}km | 요금: {{ segment.cost|fmt(',.0f') }}원
+                    </div>
+                {% endfor %}
+                </div>
+            {% endfor %}
+            </div>
+            
+"""
+
+_REPORT_FOOT_BYTES = """\
+            <div class="section">
+                <h3>📁 생성된 파일들</h3>
+                <ul>
+                    <li><strong>interactive_route_map.html</strong> - 대화형 지도 (클릭하여 열기)</li>
+                    <li><strong>route_visualization.html</strong> - Plotly 시각화</li>
+                    <li><strong>route_comparison.html</strong> - 경로 비교 차트</li>
+                    <li><strong>routes.geojson</strong> - GIS 소프트웨어용 경로 데이터</li>
+                    <li><strong>route_statistics.json</strong> - 상세 통계 데이터</li>
+                    <li><strong>visualization_data.json</strong> - 시각화 원본 데이터</li>
+                    <li><strong>report_styles.css</strong> - 리포트 스타일시트 (리포트와 같은 폴더에 있어야 함)</li>
+                </ul>
+            </div>
+            
+            <div style="text-align: center; margin-top: 40px; color: #6c757d;">
+                <p>🎯 강남구 Multi-modal RAPTOR 시스템으로 생성됨</p>
+                <p>Python + GTFS + 실제 도로망 기반 정확한 경로 시각화</p>
+            </div>
+        </body>
+        </html>
+        """.encode('utf-8')
+
+def _write_css_once(output_dir: Path):
+    """리포트 스타일시트를 출력 폴더에 기록 (내용이 같은 파일이 이미 있으면 생략)"""
+    css_path = output_dir / 'report_styles.css'
+    try:
+        if css_path.read_bytes() == _REPORT_CSS_BYTES:
+            return
+    except FileNotFoundError:
+        pass
+    css_path.write_bytes(_REPORT_CSS_BYTES)
+
+@lru_cache(maxsize=None)
+def _report_template():
+    """HTML 요약 리포트 Jinja2 템플릿 (처음 사용할 때 한 번만 컴파일)"""
+    from jinja2 import Environment
+    
+    env = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True,
+                      keep_trailing_newline=True)
+    env.filters['fmt'] = format  # {{ 값|fmt(',.0f') }} == f"{값:,.0f}"
+    return env.from_string(_REPORT_HTML)
+
+@lru_cache(maxsize=4096)
+def _journey_info_block_html(journey_id, journey_type: str, total_time,
+                             total_cost: float, total_distance_km, n_segments: int) -> str:
+    """정보 패널의 여행 한 건 블록 HTML (템플릿에 들어가는 값만 키로 캐시)"""
+    type_emoji = _JOURNEY_TYPE_EMOJI.get(journey_type, '🚌')
+    
+    return f"""
+            <div style='margin: 8px 0; padding: 8px; background: #f8f9fa; border-radius: 5px;'>
+                <div style='font-weight: bold; color: #495057;'>
+                    {type_emoji} 경로 {journey_id}
+                </div>
+                <div style='margin: 3px 0;'>
+                    ⏱️ {total_time//60}시간 {total_time%60}분
+                </div>
+                <div style='margin: 3px 0;'>
+                    💰 {total_cost:,.0f}원
+                </div>
+                <div style='margin: 3px 0;'>
+                    📏 {total_distance_km}km
+                </div>
+                <div style='margin: 3px 0; font-size: 10px; color: #6c757d;'>
+                    {n_segments}개 구간
+                </div>
+            </div>
+            """
+
+@lru_cache(maxsize=None)
+def _segment_layer_class():
+    """SegmentLayer folium 요소 클래스 (folium 지연 import 때문에 처음 사용할 때 정의)"""
+    from branca.element import Element, MacroElement
+    from folium.elements import JSCSSMixin
+    from jinja2 import Template
+    
+    class SegmentLayer(JSCSSMixin, MacroElement):
+        """여행 하나의 경로선/마커를 JSON 배열 하나로 싣고 브라우저에서 한 번에 생성하는 레이어
+
+        경로선은 encoded polyline으로 싣고 decodePolyline()으로 복원한다.
+        vector_tiles=True이면 경로선을 Leaflet.VectorGrid 슬라이서로 타일링해
+        화면에 보이는 타일만 canvas에 그린다 (줌별 단순화 포함, 방향 화살표/툴팁 없음).
+        """
+        _template = Template("""
+            {% macro script(this, kwargs) %}
+                (function(parent) {
+                {% if this.vector_tiles %}
+                    var lines = {{ this.lines|tojson }};
+                    var routes = L.vectorGrid.slicer({
+                        type: 'FeatureCollection',
+                        features: lines.map(function(s, index) {
+                            return {
+                                type: 'Feature',
+                                properties: {index: index},
+                                geometry: {
+                                    type: 'LineString',
+                                    coordinates: decodePolyline(s.encoded).map(function(p) { return [p[1], p[0]]; })
+                                }
+                            };
+                        })
+                    }, {
+                        rendererFactory: L.canvas.tile,
+                        maxZoom: 18,
+                        interactive: true,
+                        vectorTileLayerStyles: {
+                            sliced: function(properties) { return lines[properties.index].options; }
+                        }
+                    });
+                    routes.on('click', function(e) {
+                        L.popup()
+                            .setLatLng(e.latlng)
+                            .setContent(segmentPopupHtml(lines[e.layer.properties.index].popup))
+                            .openOn(routes._map);
+                    });
+                    routes.addTo(parent);
+                {% else %}
+                    {{ this.lines|tojson }}.forEach(function(s) {
+                        var line = L.polyline(decodePolyline(s.encoded), s.options)
+                            .bindPopup(function() { return segmentPopupHtml(s.popup); })
+                            .bindTooltip(s.tooltip)
+                            .addTo(parent);
+                        if (s.arrows) {
+                            line.setText("    ►    ", {
+                                repeat: true, offset: 7,
+                                attributes: {'fill': s.options.color, 'font-weight': 'bold'}
+                            });
+                        }
+                    });
+                {% endif %}
+                    {{ this.markers|tojson }}.forEach(function(mk) {
+                        var marker = mk.icon_html
+                            ? L.marker(mk.location, {icon: L.divIcon({html: mk.icon_html, className: 'bike-marker'})})
+                            : L.circleMarker(mk.location, mk.options);
+                        marker.bindPopup(mk.popup);
+                        if (mk.tooltip) { marker.bindTooltip(mk.tooltip); }
+                        marker.addTo(parent);
+                    });
+                })({{ this._parent.get_name() }});
+            {% endmacro %}
+        """)
+        
+        # 방향 화살표용 Leaflet.TextPath (folium PolyLineTextPath와 같은 스크립트)
+        default_js = [
+            ('polylinetextpath',
+             'https://cdn.jsdelivr.net/npm/leaflet-textpath@1.2.3/leaflet.textpath.min.js')
+        ]
+        
+        def __init__(self, vector_tiles: bool = False):
+            super().__init__()
+            self._name = 'SegmentLayer'
+            self.vector_tiles = vector_tiles
+            if vector_tiles:
+                self.default_js = [
+                    ('leaflet_vectorgrid',
+                     'https://unpkg.com/leaflet.vectorgrid@1.3.0/dist/Leaflet.VectorGrid.bundled.min.js')
+                ]
+            self.lines = []  # {'encoded', 'options', 'popup'(팝업 데이터), 'tooltip', 'arrows'}
+            self.markers = []  # {'location', 'popup', 'tooltip', 'options' 또는 'icon_html'}
+        
+        def render(self, **kwargs):
+            header = self.get_root().header
+            header.add_child(Element(_POLYLINE_DECODER_JS), name='polyline_decoder')
+            header.add_child(Element(_SEGMENT_POPUP_JS), name='segment_popup')
+            super().render(**kwargs)
+    
+    return SegmentLayer
+
+@lru_cache(maxsize=None)
+def _canvas_point_layer_class():
+    """CanvasPointLayer folium 요소 클래스 (folium 지연 import 때문에 처음 사용할 때 정의)"""
+    from branca.element import MacroElement
+    from folium.elements import JSCSSMixin
+    from jinja2 import Template
+    
+    class CanvasPointLayer(JSCSSMixin, MacroElement):
+        """같은 스타일의 점 [lat, lon, 이름] 목록을 canvas 렌더러 CircleMarker로 한 번에 그리는 레이어
+
+        점마다 SVG DOM 노드를 만들지 않아 정류장/대여소가 많아도 지도 로딩과 이동이 가볍다.
+        cluster=True이면 Leaflet.markercluster 그룹에 담아 낮은 줌에서는 묶음 원만 그리고
+        줌인하면 펼친다 (disableClusteringAtZoom 이상에서는 개별 점).
+        """
+        _template = Template("""
+            {% macro script(this, kwargs) %}
+                (function(parent) {
+                    var options = Object.assign({renderer: L.canvas()}, {{ this.options|tojson }});
+                    var prefix = {{ this.popup_prefix|tojson }};
+                {% if this.cluster %}
+                    var target = L.markerClusterGroup({{ this.cluster_options|tojson }});
+                {% else %}
+                    var target = parent;
+                {% endif %}
+                    {{ this.points|tojson }}.forEach(function(p) {
+                        L.circleMarker([p[0], p[1]], options)
+                            .bindPopup(function() { return prefix + p[2]; })
+                            .bindTooltip(p[2])
+                            .addTo(target);
+                    });
+                {% if this.cluster %}
+                    target.addTo(parent);
+                {% endif %}
+                })({{ this._parent.get_name() }});
+            {% endmacro %}
+        """)
+        
+        def __init__(self, points: List[list], popup_prefix: str = '',
+                     cluster: bool = False, **options):
+            super().__init__()
+            self._name = 'CanvasPointLayer'
+            self.points = points
+            self.popup_prefix = popup_prefix
+            self.options = options
+            self.cluster = cluster
+            self.cluster_options = {
+                'maxClusterRadius': 50,
+                'disableClusteringAtZoom': 15,
+                'chunkedLoading': True
+            }
+            if cluster:
+                # folium MarkerCluster와 같은 Leaflet.markercluster 배포본
+                self.default_js = [
+                    ('markerclusterjs',
+                     'https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/leaflet.markercluster.js')
+                ]
+                self.default_css = [
+                    ('markerclustercss',
+                     'https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/MarkerCluster.css'),
+                    ('markerclusterdefaultcss',
+                     'https://cdnjs.cloudflare.com/ajax/libs/leaflet.markercluster/1.1.0/MarkerCluster.Default.css')
+                ]
+    
+    return CanvasPointLayer
+
+# 이보다 큰 배열만 numexpr로 계산 (작은 배열은 호출 오버헤드가 더 큼)
+NUMEXPR_MIN_SIZE = 4096
+
+def _haversine_vec(lat1, lon1, lats, lons) -> np.ndarray:
+    """하버사인 거리 일괄 계산 (km, 스칼라/배열 모두 브로드캐스트)"""
+    lat1_rad = np.radians(lat1)
+    lats_rad = np.radians(lats)
+    delta_lat = lats_rad - lat1_rad
+    delta_lon = np.radians(np.subtract(lons, lon1))
+    if NUMEXPR_AVAILABLE and np.size(delta_lat) >= NUMEXPR_MIN_SIZE:
+        # 임시 배열 없이 멀티스레드 단일 패스로 계산
+        return numexpr.evaluate(
+            '6371 * 2 * arcsin(sqrt(sin(delta_lat / 2) ** 2'
+            ' + cos(lat1_rad) * cos(lats_rad) * sin(delta_lon / 2) ** 2))',
+            local_dict={'lat1_rad': lat1_rad, 'lats_rad': lats_rad,
+                        'delta_lat': delta_lat, 'delta_lon': delta_lon})
+    a = np.sin(delta_lat / 2) ** 2 + np.cos(lat1_rad) * np.cos(lats_rad) * np.sin(delta_lon / 2) ** 2
+    return 6371 * 2 * np.arcsin(np.sqrt(a))
+
 # =============================================================================
 # 시각화용 데이터 구조 정의
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class VisualizationSegment:
     """시각화용 경로 세그먼트"""
     mode: str  # walk, bike, transit, bike_rental, bike_return
     route_name: str
     start_point: Tuple[float, float]  # (lat, lon)
     end_point: Tuple[float, float]
-    coordinates: List[Tuple[float, float]]  # 실제 경로 좌표들
+    coordinates: np.ndarray  # 실제 경로 좌표들 ((K, 2) [lat, lon] 배열)
     duration: int  # 분
     distance: float  # km
     cost: float
     color: str
     route_type: str  # subway, bus, walk, bike
     route_id: Optional[str] = None
+    encoded_polyline: str = ''  # Google encoded polyline (지도 렌더링용)
+    
+    @property
+    def lats(self) -> np.ndarray:
+        """위도 열 (coordinates의 복사 없는 view)"""
+        return self.coordinates[:, 0]
+    
+    @property
+    def lons(self) -> np.ndarray:
+        """경도 열 (coordinates의 복사 없는 view)"""
+        return self.coordinates[:, 1]
 
-@dataclass
+@dataclass(slots=True)
 class VisualizationJourney:
     """시각화용 완전한 여행 경로"""
     journey_id: int
@@ -59,6 +593,28 @@ class VisualizationJourney:
     segments: List[VisualizationSegment]
     summary_stats: Dict[str, Any]
 
+class JourneyCollection(list):
+    """VisualizationJourney 목록 + 요약 지표 배열 (생성 시 한 번만 추출)
+
+    차트/통계가 같은 시간/요금/거리 값을 여행마다 다시 꺼내지 않도록 NumPy 배열로 보관한다.
+    생성 후에는 목록을 수정하지 않는 것으로 가정한다.
+    """
+    
+    def __init__(self, journeys=()):
+        super().__init__(journeys)
+        self.journey_ids = [j.journey_id for j in self]
+        self.journey_types = [j.journey_type for j in self]
+        # 입력 타입 유지 (정수 시간/요금은 정수 배열)
+        self.times = np.asarray([j.total_time for j in self])
+        self.costs = np.asarray([j.total_cost for j in self])
+        self.distances = np.asarray([j.summary_stats['total_distance_km'] for j in self])
+        self.efficiency = self.times * 0.6 + (self.costs / 1000) * 0.4
+    
+    @classmethod
+    def wrap(cls, journeys) -> 'JourneyCollection':
+        """이미 JourneyCollection이면 그대로, 아니면 새로 감싸서 반환"""
+        return journeys if isinstance(journeys, cls) else cls(journeys)
+
 # =============================================================================
 # 메인 시각화 엔진 클래스
 # =============================================================================
@@ -66,9 +622,10 @@ class VisualizationJourney:
 class GangnamRAPTORVisualizer:
     """강남구 Multi-modal RAPTOR 경로 시각화 엔진"""
     
-    def __init__(self, data_path: str, raptor_results_path: str):
+    def __init__(self, data_path: str, raptor_results_path: str, show_infrastructure: bool = True):
         self.data_path = Path(data_path)
         self.results_path = Path(raptor_results_path)
+        self.show_infrastructure = show_infrastructure  # 지도에 지하철역/따릉이 대여소 레이어 표시
         
         # 기본 데이터
         self.stops = {}
@@ -76,7 +633,22 @@ class GangnamRAPTORVisualizer:
         self.trips = {}
         self.bike_stations = {}
         self.road_graph = None
-        self.route_shapes = {}  # 실제 노선 경로
+        self._road_nodes = []  # 그래프 노드 목록 (최근접 노드 검색용)
+        self._node_lat = np.empty(0)
+        self._node_lon = np.empty(0)
+        self._node_tree = None  # 하버사인 BallTree (scikit-learn 있을 때)
+        self._road_csr = None  # {'walk': 홉 수, 'bike': 거리} CSR 인접행렬 (SciPy 있을 때, 첫 사용 시 생성)
+        self._road_node_index = {}
+        self._reset_road_path_cache()
+        self._name_to_coords = {}  # 정류장/대여소 이름 → 좌표 (정류장 → 대여소 순회 순서)
+        self._names = []  # 이름 목록 (순회 순서)
+        self._name_rank = {}  # 이름 → 순회 순서
+        self._name_text = ''  # 순회 순서대로 '\n'으로 이어 붙인 이름 (위치명을 포함하는 이름 검색)
+        self._name_offsets = []  # _name_text 안의 각 이름 시작 위치
+        self._max_name_len = 0
+        self.route_shapes = {}  # 실제 노선 경로 (route_id → (K, 2) [lat, lon] 배열)
+        self._stop_routes = {}  # 정류장 → 경유 route_id 목록 (RAPTOR 구조)
+        self._stop_route_types = {}  # 정류장 → 경유 노선 route_type 집합
         
         # RAPTOR 결과
         self.journey_results = []
@@ -112,75 +684,192 @@ class GangnamRAPTORVisualizer:
         # 1. 기본 교통 데이터
         self._load_transportation_data()
         
-        # 2. 도로망 데이터
-        self._load_road_network()
+        # 2. 도로망 + 4. 실제 경로 데이터 (통합 캐시가 있으면 한 번에 로드)
+        if not self._load_combined_cache():
+            raptor_structures = self._load_raptor_structures()
+            self._load_road_network()
+            self._load_route_geometries(raptor_structures)
+            self._stop_routes = (raptor_structures or {}).get('stop_routes', {})
+            self._save_combined_cache()
+        
+        # 정류장별 경유 노선 유형 (지하철역 판별용)
+        self._build_stop_route_types()
         
         # 3. RAPTOR 결과 데이터
         self._load_raptor_results()
         
-        # 4. 실제 경로 데이터 (GTFS shapes 등)
-        self._load_route_geometries()
+        # 위치명 → 좌표 조회 인덱스
+        self._build_location_index()
         
         print("✅ 데이터 로딩 완료")
     
+    # 통합 캐시 파일명 / 캐시보다 새로우면 무효화할 원본 파일들
+    VIZ_CACHE_FILE = 'gangnam_viz_cache.pkl'
+    VIZ_CACHE_VERSION = 4
+    VIZ_CACHE_SOURCES = ('gangnam_road_graph.pkl', 'gangnam_road_graph.gpickle',
+                         'gangnam_raptor_structures.pkl', 'shapes.csv', 'gangnam_stops.csv')
+    
+    # 렌더링 좌표 단순화 허용 오차 (도 단위, 약 1m)
+    SIMPLIFY_TOLERANCE = 1e-5
+    
+    # 전체 세그먼트가 이 수 이상이면 대화형 지도의 경로선을 벡터 타일(VectorGrid)로 렌더링
+    VECTOR_TILE_MIN_SEGMENTS = 300
+    
+    # 인프라 레이어(지하철역/따릉이 대여소) 점이 이 수 이상이면 마커 클러스터로 묶어 렌더링
+    INFRA_CLUSTER_MIN_POINTS = 500
+    
+    def _load_combined_cache(self) -> bool:
+        """도로 그래프 / 노드 인덱스 / 노선 경로 통합 캐시 로드 (성공 시 True)"""
+        import pickle
+        cache_file = self.data_path / self.VIZ_CACHE_FILE
+        if not cache_file.exists():
+            return False
+        
+        cache_mtime = cache_file.stat().st_mtime
+        for name in self.VIZ_CACHE_SOURCES:
+            source = self.data_path / name
+            if source.exists() and source.stat().st_mtime > cache_mtime:
+                print(f"   🔄 통합 캐시 갱신 필요 ({name} 변경)")
+                return False
+        
+        try:
+            with open(cache_file, 'rb') as f:
+                cache = pickle.load(f)
+            if cache.get('version') != self.VIZ_CACHE_VERSION:
+                return False
+            
+            if 'road_csr' in cache:
+                # CSR 배열만 저장된 캐시는 SciPy가 있어야 사용 가능 (NetworkX 그래프는 만들지 않음)
+                if not SCIPY_AVAILABLE:
+                    return False
+                self._road_csr = cache['road_csr']
+                self._reset_road_sssp_cache()
+            else:
+                self.road_graph = cache['road_graph']
+            self._node_lat = cache['node_lat']
+            self._node_lon = cache['node_lon']
+            self._node_tree = cache['node_tree']
+            self.route_shapes = cache['route_shapes']
+            self._stop_routes = cache['stop_routes']
+        except Exception as e:
+            print(f"   ⚠️ 통합 캐시 로드 실패: {e}")
+            return False
+        
+        self._road_nodes = list(zip(self._node_lat.tolist(), self._node_lon.tolist()))
+        self._road_node_index = {node: i for i, node in enumerate(self._road_nodes)}
+        self._reset_road_path_cache()
+        
+        # 캐시 저장 시 scikit-learn이 없었다면 지금 BallTree 생성
+        if self._node_tree is None and SKLEARN_AVAILABLE and len(self._road_nodes):
+            from sklearn.neighbors import BallTree
+            self._node_tree = BallTree(np.radians(np.column_stack([self._node_lat, self._node_lon])),
+                                       metric='haversine')
+        
+        print(f"   ✅ 통합 캐시: {len(self._road_nodes):,}개 노드, {len(self.route_shapes)}개 노선 경로")
+        return True
+    
+    def _save_combined_cache(self):
+        """도로 그래프 / 노드 인덱스 / 노선 경로를 하나의 pickle로 저장
+
+        SciPy가 있으면 그래프 대신 CSR 인접행렬(NumPy 배열)만 저장해
+        다음 실행에서 엣지 속성 dict를 하나하나 복원하지 않는다.
+        """
+        import pickle
+        if self.road_graph is None:
+            return
+        
+        cache = {
+            'version': self.VIZ_CACHE_VERSION,
+            'node_lat': self._node_lat,
+            'node_lon': self._node_lon,
+            'node_tree': self._node_tree,
+            'route_shapes': self.route_shapes,
+            'stop_routes': self._stop_routes
+        }
+        if SCIPY_AVAILABLE:
+            if self._road_csr is None:
+                self._build_road_csr()
+            cache['road_csr'] = self._road_csr
+        else:
+            cache['road_graph'] = self.road_graph
+        try:
+            with open(self.data_path / self.VIZ_CACHE_FILE, 'wb') as f:
+                pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"   ⚠️ 통합 캐시 저장 실패: {e}")
+    
     def _load_transportation_data(self):
         """교통 데이터 로드"""
         try:
             # 정류장 데이터
             stops_file = self.data_path / 'gangnam_stops.csv'
             if stops_file.exists():
-                stops_df = pd.read_csv(stops_file, encoding='utf-8')
-                for _, row in stops_df.iterrows():
-                    self.stops[row['stop_id']] = {
-                        'name': row.get('stop_name', f'정류장_{row["stop_id"]}'),
-                        'lat': row['stop_lat'],
-                        'lon': row['stop_lon']
-                    }
+                stops_df = _read_tabular(stops_file)
+                stop_ids = stops_df['stop_id'].tolist()
+                if 'stop_name' in stops_df:
+                    stop_names = stops_df['stop_name'].tolist()
+                else:
+                    stop_names = [f'정류장_{stop_id}' for stop_id in stop_ids]
+                self.stops.update(
+                    (stop_id, {'name': name, 'lat': lat, 'lon': lon})
+                    for stop_id, name, lat, lon in zip(stop_ids, stop_names,
+                                                       stops_df['stop_lat'].tolist(),
+                                                       stops_df['stop_lon'].tolist())
+                )
                 print(f"   ✅ 정류장: {len(self.stops)}개")
             
             # 노선 데이터
             routes_file = self.data_path / 'gangnam_routes.csv'
             if routes_file.exists():
-                routes_df = pd.read_csv(routes_file, encoding='utf-8')
-                for _, row in routes_df.iterrows():
-                    route_type = row.get('route_type', 3)
-                    route_name = str(row.get('route_short_name', row['route_id']))
-                    
-                    # 색상 결정
-                    if route_type == 1:  # 지하철
-                        if '2' in route_name:
-                            color = self.color_schemes['subway_2']
-                        elif '7' in route_name:
-                            color = self.color_schemes['subway_7']
-                        elif '9' in route_name:
-                            color = self.color_schemes['subway_9']
-                        elif '분당' in route_name or 'K' in route_name:
-                            color = self.color_schemes['subway_bundang']
-                        elif '신분당' in route_name or 'D' in route_name:
-                            color = self.color_schemes['subway_shinbundang']
-                        else:
-                            color = '#0066CC'
-                    else:  # 버스
-                        color = self.color_schemes['bus']
-                    
-                    self.routes[row['route_id']] = {
-                        'name': route_name,
-                        'type': route_type,
-                        'color': color,
-                        'long_name': row.get('route_long_name', route_name)
-                    }
+                routes_df = _read_tabular(routes_file)
+                route_types = routes_df['route_type'] if 'route_type' in routes_df else pd.Series(3, index=routes_df.index)
+                name_col = 'route_short_name' if 'route_short_name' in routes_df else 'route_id'
+                route_names = routes_df[name_col].astype(str)
+                
+                # 색상 결정 (지하철은 노선명 패턴, 그 외는 버스 색상)
+                is_subway = (route_types == 1).to_numpy()
+                matches = lambda pattern: route_names.str.contains(pattern, regex=True).to_numpy()
+                colors = np.select(
+                    [~is_subway] + [matches(pattern) for pattern in _SUBWAY_LINE_PATTERNS],
+                    [
+                        self.color_schemes['bus'],
+                        self.color_schemes['subway_2'],
+                        self.color_schemes['subway_7'],
+                        self.color_schemes['subway_9'],
+                        self.color_schemes['subway_shinbundang'],
+                        self.color_schemes['subway_bundang']
+                    ],
+                    default='#0066CC'
+                )
+                
+                route_names = route_names.tolist()
+                if 'route_long_name' in routes_df:
+                    long_names = routes_df['route_long_name'].tolist()
+                else:
+                    long_names = route_names
+                self.routes.update(
+                    (route_id, {'name': name, 'type': route_type, 'color': color, 'long_name': long_name})
+                    for route_id, name, route_type, color, long_name in zip(
+                        routes_df['route_id'].tolist(), route_names, route_types.tolist(),
+                        colors.tolist(), long_names)
+                )
                 print(f"   ✅ 노선: {len(self.routes)}개")
             
             # 따릉이 데이터
             bike_file = self.data_path / 'gangnam_bike_stations.csv'
             if bike_file.exists():
-                bike_df = pd.read_csv(bike_file, encoding='utf-8')
-                for _, row in bike_df.iterrows():
-                    self.bike_stations[str(row['station_id'])] = {
-                        'name': self._clean_name(row.get('address1', f'대여소_{row["station_id"]}')),
-                        'lat': row['latitude'],
-                        'lon': row['longitude']
-                    }
+                bike_df = _read_tabular(bike_file)
+                station_ids = bike_df['station_id'].astype(str).tolist()
+                if 'address1' in bike_df:
+                    names = [self._clean_name(name) for name in bike_df['address1'].tolist()]
+                else:
+                    names = [f'대여소_{station_id}' for station_id in station_ids]
+                self.bike_stations.update(
+                    (station_id, {'name': name, 'lat': lat, 'lon': lon})
+                    for station_id, name, lat, lon in zip(station_ids, names,
+                                                          bike_df['latitude'].tolist(),
+                                                          bike_df['longitude'].tolist())
+                )
                 print(f"   ✅ 따릉이: {len(self.bike_stations)}개소")
                 
         except Exception as e:
@@ -188,6 +877,8 @@ class GangnamRAPTORVisualizer:
     
     def _load_road_network(self):
         """도로망 데이터 로드"""
+        import pickle
+        import networkx as nx
         try:
             # NetworkX 그래프 로드
             graph_files = [
@@ -212,18 +903,36 @@ class GangnamRAPTORVisualizer:
             if self.road_graph is None:
                 print("   🔧 기본 도로망 생성...")
                 self._create_basic_road_network()
+            
+            self._index_road_nodes()
                 
         except Exception as e:
             print(f"   ⚠️ 도로망 로드 실패: {e}")
     
+    def _index_road_nodes(self):
+        """그래프 노드 좌표를 NumPy 배열 / BallTree로 보관 (최근접 노드 검색용)"""
+        self._road_nodes = list(self.road_graph.nodes())
+        node_coords = np.array(self._road_nodes, dtype=np.float64).reshape(-1, 2)
+        self._node_lat = node_coords[:, 0]
+        self._node_lon = node_coords[:, 1]
+        if SKLEARN_AVAILABLE and len(node_coords):
+            from sklearn.neighbors import BallTree
+            self._node_tree = BallTree(np.radians(node_coords), metric='haversine')
+        self._reset_road_path_cache()
+    
+    def _reset_road_path_cache(self):
+        """도로 경로 캐시를 인스턴스 단위로 새로 만든다 (노드 인덱스가 바뀌면 이전 결과를 함께 버림)"""
+        self._road_path_cached = lru_cache(maxsize=4096)(self._compute_road_path)
+    
     def _load_raptor_results(self):
         """RAPTOR 결과 로드"""
         try:
             # JSON 결과 파일 로드
             results_file = self.results_path / 'journey_results.json'
             if results_file.exists():
-                with open(results_file, 'r', encoding='utf-8') as f:
-                    self.journey_results = json.load(f)
+                with open(results_file, 'rb') as f:
+                    raw = f.read()
+                self.journey_results = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
                 print(f"   ✅ RAPTOR 결과: {len(self.journey_results)}개 경로")
             else:
                 print(f"   ⚠️ RAPTOR 결과 파일 없음: {results_file}")
@@ -231,51 +940,71 @@ class GangnamRAPTORVisualizer:
         except Exception as e:
             print(f"   ⚠️ RAPTOR 결과 로드 실패: {e}")
     
-    def _load_route_geometries(self):
+    def _load_raptor_structures(self) -> Optional[Dict]:
+        """Part 1의 RAPTOR 구조 pickle 로드 (없거나 실패하면 None)"""
+        import pickle
+        raptor_file = self.data_path / 'gangnam_raptor_structures.pkl'
+        if not raptor_file.exists():
+            return None
+        try:
+            with open(raptor_file, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"   ⚠️ RAPTOR 구조 로드 실패: {e}")
+            return None
+    
+    def _build_stop_route_types(self):
+        """정류장별 경유 노선 유형 집합 생성 (route_type은 매번 읽는 노선 CSV 기준)"""
+        route_types = {route_id: route_data.get('type', 3) for route_id, route_data in self.routes.items()}
+        self._stop_route_types = {
+            stop_id: {route_types[route_id] for route_id in route_ids if route_id in route_types}
+            for stop_id, route_ids in self._stop_routes.items()
+        }
+    
+    def _load_route_geometries(self, raptor_structures: Optional[Dict] = None):
         """실제 노선 경로 데이터 로드"""
         try:
             # GTFS shapes 데이터가 있다면 로드
             shapes_file = self.data_path / 'shapes.csv'
             if shapes_file.exists():
-                shapes_df = pd.read_csv(shapes_file, encoding='utf-8')
+                shapes_df = _read_tabular(shapes_file)
                 # shapes 데이터 처리 (추후 구현)
                 print(f"   ✅ 실제 노선 경로 로드")
             else:
                 # shapes가 없으면 stop 순서 기반으로 경로 생성
                 print("   🔧 정류장 순서 기반 경로 생성...")
-                self._generate_route_paths_from_stops()
+                if raptor_structures is not None:
+                    self._generate_route_paths_from_stops(raptor_structures.get('route_patterns', {}))
                 
         except Exception as e:
             print(f"   ⚠️ 노선 경로 로드 실패: {e}")
     
-    def _generate_route_paths_from_stops(self):
-        """정류장 순서 기반으로 노선 경로 생성"""
+    def _generate_route_paths_from_stops(self, route_patterns: Dict[str, List]):
+        """정류장 순서 기반으로 노선 경로 생성 (RAPTOR route patterns)"""
         try:
-            # RAPTOR 구조에서 route patterns 로드
-            raptor_file = self.data_path / 'gangnam_raptor_structures.pkl'
-            if raptor_file.exists():
-                with open(raptor_file, 'rb') as f:
-                    raptor_data = pickle.load(f)
-                    route_patterns = raptor_data.get('route_patterns', {})
-                    
-                    for route_id, stop_pattern in route_patterns.items():
-                        if len(stop_pattern) >= 2:
-                            coordinates = []
-                            for stop_id in stop_pattern:
-                                if stop_id in self.stops:
-                                    stop = self.stops[stop_id]
-                                    coordinates.append((stop['lat'], stop['lon']))
-                            
-                            if len(coordinates) >= 2:
-                                self.route_shapes[route_id] = coordinates
-                
-                print(f"   ✅ 노선 경로 생성: {len(self.route_shapes)}개")
+            patterns = [(route_id, stop_pattern) for route_id, stop_pattern in route_patterns.items()
+                        if len(stop_pattern) >= 2]
+            if patterns and self.stops:
+                # 전체 패턴의 정류장 ID를 한 번에 행 번호로 변환 (없는 정류장은 -1)
+                stops_df = pd.DataFrame.from_dict(self.stops, orient='index')
+                stop_coords = stops_df[['lat', 'lon']].to_numpy(dtype=np.float64)
+                positions = stops_df.index.get_indexer(
+                    [stop_id for _, stop_pattern in patterns for stop_id in stop_pattern])
+                offsets = np.cumsum([len(stop_pattern) for _, stop_pattern in patterns])[:-1]
                 
+                for (route_id, _), pattern_positions in zip(patterns, np.split(positions, offsets)):
+                    pattern_positions = pattern_positions[pattern_positions >= 0]
+                    if len(pattern_positions) >= 2:
+                        self.route_shapes[route_id] = stop_coords[pattern_positions]
+            
+            print(f"   ✅ 노선 경로 생성: {len(self.route_shapes)}개")
+            
         except Exception as e:
             print(f"   ⚠️ 노선 경로 생성 실패: {e}")
     
     def _create_basic_road_network(self):
         """기본 도로망 생성 (그래프가 없는 경우)"""
+        import networkx as nx
         self.road_graph = nx.Graph()
         
         # 강남구 그리드 생성
@@ -288,20 +1017,52 @@ class GangnamRAPTORVisualizer:
             for lon in np.arange(lon_min, lon_max, grid_size):
                 self.road_graph.add_node((lat, lon))
         
-        # 인접 노드 연결
+        # 인접 노드 연결 (300m 이내 노드 쌍 i < j)
         nodes = list(self.road_graph.nodes())
-        for i, (lat1, lon1) in enumerate(nodes):
-            for lat2, lon2 in nodes[i+1:]:
-                distance = self._haversine_distance(lat1, lon1, lat2, lon2)
-                if distance <= 0.3:  # 300m 이내 연결
-                    self.road_graph.add_edge(
-                        (lat1, lon1), (lat2, lon2),
-                        distance=distance,
-                        weight=distance
-                    )
+        node_coords = np.array(nodes, dtype=np.float64)
+        pair_i, pair_j = self._grid_pairs_within(node_coords, 0.3)
+        distances = _haversine_vec(node_coords[pair_i, 0], node_coords[pair_i, 1],
+                                   node_coords[pair_j, 0], node_coords[pair_j, 1])
+        self.road_graph.add_edges_from(
+            (nodes[i], nodes[j], {'distance': d, 'weight': d})
+            for i, j, d in zip(pair_i.tolist(), pair_j.tolist(), distances.tolist())
+        )
         
         print(f"   ✅ 기본 그리드: {self.road_graph.number_of_nodes():,}개 노드, {self.road_graph.number_of_edges():,}개 엣지")
     
+    def _grid_pairs_within(self, node_coords: np.ndarray, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 내 노드 쌍 (i < j, i→j 순 정렬) 인덱스
+
+        scikit-learn이 있으면 하버사인 BallTree 반경 검색, 없으면 행 단위 일괄 계산
+        """
+        if SKLEARN_AVAILABLE:
+            from sklearn.neighbors import BallTree
+            tree = BallTree(np.radians(node_coords), metric='haversine')
+            # 경계값은 아래 하버사인 재검사로 확정 (여유 반경으로 후보 검색)
+            neighbors = tree.query_radius(np.radians(node_coords), r=radius_km * 1.0001 / 6371)
+            counts = np.array([len(n) for n in neighbors])
+            pair_i = np.repeat(np.arange(len(node_coords)), counts)
+            pair_j = np.concatenate(neighbors) if len(neighbors) else np.empty(0, dtype=np.int64)
+            keep = pair_i < pair_j
+            pair_i, pair_j = pair_i[keep], pair_j[keep]
+            distances = _haversine_vec(node_coords[pair_i, 0], node_coords[pair_i, 1],
+                                       node_coords[pair_j, 0], node_coords[pair_j, 1])
+            keep = distances <= radius_km
+            pair_i, pair_j = pair_i[keep], pair_j[keep]
+            order = np.lexsort((pair_j, pair_i))
+            return pair_i[order], pair_j[order]
+        
+        rows, cols = [], []
+        for i in range(len(node_coords) - 1):
+            distances = _haversine_vec(node_coords[i, 0], node_coords[i, 1],
+                                       node_coords[i+1:, 0], node_coords[i+1:, 1])
+            near = np.flatnonzero(distances <= radius_km) + i + 1
+            rows.append(np.full(len(near), i))
+            cols.append(near)
+        if not rows:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(rows), np.concatenate(cols)
+    
     # =============================================================================
     # 실제 경로 생성 함수들 (핵심 기능)
     # =============================================================================
@@ -328,6 +1089,12 @@ class GangnamRAPTORVisualizer:
                 viz_segment = self._generate_default_route(segment)
             
             if viz_segment:
+                # 거리는 원본 좌표로 이미 계산됨 - 렌더링용 좌표만 단순화
+                if len(viz_segment.coordinates) > 2:
+                    viz_segment.coordinates = _simplify_coordinates(
+                        viz_segment.coordinates, self.SIMPLIFY_TOLERANCE)
+                if len(viz_segment.coordinates) >= 2:
+                    viz_segment.encoded_polyline = _encode_polyline(viz_segment.coordinates)
                 viz_segments.append(viz_segment)
         
         # 경로 요약 통계
@@ -373,7 +1140,7 @@ class GangnamRAPTORVisualizer:
             route_name='도보',
             start_point=start_coords,
             end_point=end_coords,
-            coordinates=path_coords,
+            coordinates=coords_array(path_coords),
             duration=segment.get('duration', 5),
             distance=actual_distance,
             cost=segment.get('cost', 0),
@@ -402,7 +1169,7 @@ class GangnamRAPTORVisualizer:
             route_name=f'따릉이 {segment.get("duration", 10)}분',
             start_point=start_coords,
             end_point=end_coords,
-            coordinates=path_coords,
+            coordinates=coords_array(path_coords),
             duration=segment.get('duration', 10),
             distance=actual_distance,
             cost=segment.get('cost', 1000),
@@ -448,7 +1215,7 @@ class GangnamRAPTORVisualizer:
             route_name=route_name,
             start_point=start_coords,
             end_point=end_coords,
-            coordinates=path_coords,
+            coordinates=coords_array(path_coords),
             duration=segment.get('duration', 15),
             distance=actual_distance,
             cost=segment.get('cost', 1370),
@@ -471,7 +1238,7 @@ class GangnamRAPTORVisualizer:
             route_name=segment.get('route_info', '따릉이 대여/반납'),
             start_point=station_coords,
             end_point=station_coords,
-            coordinates=[station_coords],
+            coordinates=coords_array([station_coords]),
             duration=segment.get('duration', 2),
             distance=0.0,
             cost=segment.get('cost', 0),
@@ -490,7 +1257,7 @@ class GangnamRAPTORVisualizer:
             route_name=segment.get('route_info', '이동'),
             start_point=start_coords,
             end_point=end_coords,
-            coordinates=[start_coords, end_coords],
+            coordinates=coords_array([start_coords, end_coords]),
             duration=segment.get('duration', 5),
             distance=0.5,
             cost=segment.get('cost', 0),
@@ -502,46 +1269,96 @@ class GangnamRAPTORVisualizer:
     # 좌표 및 경로 계산 유틸리티
     # =============================================================================
     
-    def _extract_coordinates_from_location(self, location_name: str) -> Optional[Tuple[float, float]]:
-        """위치 이름에서 좌표 추출"""
+    # 특정 지명 좌표 (정류장/대여소 이름으로 찾지 못한 경우)
+    KNOWN_LOCATIONS = {
+        '강남역': (37.498095, 127.027610),
+        '역삼역': (37.500108, 127.036394),
+        '선릉역': (37.504741, 127.048976),
+        '삼성역': (37.508847, 127.063804),
+        '종합운동장역': (37.510994, 127.073617),
+        '신논현역': (37.504631, 127.025327),
+        '논현역': (37.511221, 127.022223),
+        '학동역': (37.514090, 127.041910),
+        '압구정로데오역': (37.527082, 127.040139),
+        '강남구청역': (37.517307, 127.041758)
+    }
+    KNOWN_LOCATION_PATTERN = re.compile('|'.join(map(re.escape, KNOWN_LOCATIONS)))
+    
+    def _build_location_index(self):
+        """정류장/대여소 이름 → 좌표 사전과 이름 검색 인덱스 생성 (정류장 우선)
+
+        같은 이름의 정류장이 많아 이름 문자열은 sys.intern으로 하나만 보관한다.
+        """
+        self._name_to_coords = {}
+        for source in (self.stops, self.bike_stations):
+            for data in source.values():
+                name = data['name']
+                if isinstance(name, str) and name:
+                    name = data['name'] = sys.intern(name)
+                    if name not in self._name_to_coords:
+                        self._name_to_coords[name] = (data['lat'], data['lon'])
+        
+        self._names = names = list(self._name_to_coords)
+        self._name_rank = {name: i for i, name in enumerate(names)}
+        self._name_text = '\n'.join(names)
+        self._name_offsets = []
+        offset = 0
+        for name in names:
+            self._name_offsets.append(offset)
+            offset += len(name) + 1
+        self._max_name_len = max(map(len, names), default=0)
+        
+        # 위치명 캐시는 인덱스와 함께 새로 만든다 (재구축 시 이전 결과를 함께 버림)
+        self._extract_coordinates_from_location = lru_cache(maxsize=2048)(self._find_location_coordinates)
+    
+    def _find_location_coordinates(self, location_name: str) -> Optional[Tuple[float, float]]:
+        """위치 이름에서 좌표 추출 (_extract_coordinates_from_location으로 캐시해서 호출)
+
+        정류장 → 대여소 순서로 이름이 위치명에 포함되거나 위치명이 이름에 포함되는
+        첫 항목을 찾고, 없으면 특정 지명에서 찾는다. 순회 대신 이름 인덱스로 찾는다.
+        """
         if not location_name or location_name in ['출발지', '목적지']:
             return None
         
-        # 정류장에서 찾기
-        for stop_id, stop_data in self.stops.items():
-            if stop_data['name'] in location_name or location_name in stop_data['name']:
-                return (stop_data['lat'], stop_data['lon'])
-        
-        # 따릉이 대여소에서 찾기
-        for station_id, station_data in self.bike_stations.items():
-            if station_data['name'] in location_name or location_name in station_data['name']:
-                return (station_data['lat'], station_data['lon'])
-        
-        # 특정 지명 매칭
-        known_locations = {
-            '강남역': (37.498095, 127.027610),
-            '역삼역': (37.500108, 127.036394),
-            '선릉역': (37.504741, 127.048976),
-            '삼성역': (37.508847, 127.063804),
-            '종합운동장역': (37.510994, 127.073617),
-            '신논현역': (37.504631, 127.025327),
-            '논현역': (37.511221, 127.022223),
-            '학동역': (37.514090, 127.041910),
-            '압구정로데오역': (37.527082, 127.040139),
-            '강남구청역': (37.517307, 127.041758)
-        }
-        
-        for place_name, coords in known_locations.items():
-            if place_name in location_name:
-                return coords
+        # 1. 위치명 안에 포함된 이름 (부분 문자열마다 사전 조회, 가장 앞 순서)
+        rank = self._name_rank
+        best = None
+        length = len(location_name)
+        for i in range(length):
+            for j in range(i + 1, min(length, i + self._max_name_len) + 1):
+                r = rank.get(location_name[i:j])
+                if r is not None and (best is None or r < best):
+                    best = r
+        
+        # 2. 위치명을 포함하는 이름 (이어 붙인 문자열의 첫 위치 = 가장 앞 순서)
+        if '\n' not in location_name:
+            pos = self._name_text.find(location_name)
+            if pos >= 0:
+                r = bisect.bisect_right(self._name_offsets, pos) - 1
+                if best is None or r < best:
+                    best = r
+        
+        if best is not None:
+            return self._name_to_coords[self._names[best]]
+        
+        # 3. 특정 지명 매칭 (정규식으로 지명이 없는 위치명은 바로 제외, 있으면 사전 순서대로)
+        if self.KNOWN_LOCATION_PATTERN.search(location_name):
+            for place_name, coords in self.KNOWN_LOCATIONS.items():
+                if place_name in location_name:
+                    return coords
         
         return None
     
     def _find_road_path(self, start: Tuple[float, float], end: Tuple[float, float], 
                        mode: str = 'walk') -> List[Tuple[float, float]]:
         """실제 도로망에서 경로 찾기"""
-        if not self.road_graph:
-            return [start, end]
+        return list(self._road_path_cached(tuple(start), tuple(end), mode))
+    
+    def _compute_road_path(self, start: Tuple[float, float], end: Tuple[float, float],
+                           mode: str) -> Tuple[Tuple[float, float], ...]:
+        """출발/도착 좌표 쌍 단위 도로 경로 (_road_path_cached로 캐시, 여러 경로가 공유하므로 튜플로 반환)"""
+        if len(self._road_nodes) == 0:
+            return (start, end)
         
         try:
             # 가장 가까운 노드 찾기
@@ -549,83 +1366,103 @@ class GangnamRAPTORVisualizer:
             end_node = self._find_nearest_graph_node(end)
             
             if start_node and end_node and start_node != end_node:
-                # 최단 경로 계산
-                if mode == 'bike':
-                    # 자전거는 거리 기준
-                    path = nx.shortest_path(self.road_graph, start_node, end_node, weight='distance')
+                # 최단 경로 계산 (SciPy가 있으면 CSR Dijkstra)
+                if SCIPY_AVAILABLE:
+                    path = self._shortest_path_csr(start_node, end_node, mode)
+                    if path is None:
+                        return (start, end)
                 else:
-                    # 도보는 가중치 없음
-                    path = nx.shortest_path(self.road_graph, start_node, end_node)
+                    import networkx as nx
+                    if mode == 'bike':
+                        # 자전거는 거리 기준
+                        path = nx.shortest_path(self.road_graph, start_node, end_node, weight='distance')
+                    else:
+                        # 도보는 가중치 없음
+                        path = nx.shortest_path(self.road_graph, start_node, end_node)
                 
                 # 실제 시작/끝점 포함
-                full_path = [start] + list(path) + [end]
-                return full_path
+                return (start, *path, end)
             
-        except (nx.NetworkXNoPath, nx.NodeNotFound, Exception):
+        except Exception:
+            # 경로 없음 (NetworkXNoPath / NodeNotFound 포함)
             pass
         
         # 실패시 직선
-        return [start, end]
+        return (start, end)
     
-    def _find_nearest_graph_node(self, point: Tuple[float, float]) -> Optional[Tuple[float, float]]:
-        """그래프에서 가장 가까운 노드 찾기"""
-        if not self.road_graph:
+    def _shortest_path_csr(self, start_node: Tuple[float, float], end_node: Tuple[float, float],
+                           mode: str) -> Optional[List[Tuple[float, float]]]:
+        """CSR 인접행렬 위 SciPy Dijkstra 최단 경로 (도보: 홉 수, 자전거: 거리)"""
+        if self._road_csr is None:
+            self._build_road_csr()
+        
+        start_idx = self._road_node_index.get(start_node)
+        end_idx = self._road_node_index.get(end_node)
+        if start_idx is None or end_idx is None:
             return None
         
-        min_distance = float('inf')
-        nearest_node = None
-        
-        # 주변 노드만 검색 (성능 최적화)
-        lat, lon = point
-        candidate_nodes = [
-            node for node in self.road_graph.nodes() 
-            if abs(node[0] - lat) < 0.01 and abs(node[1] - lon) < 0.01
-        ]
-        
-        if not candidate_nodes:
-            # 전체 노드에서 샘플링
-            all_nodes = list(self.road_graph.nodes())
-            candidate_nodes = all_nodes[::max(1, len(all_nodes)//100)]
-        
-        for node in candidate_nodes:
-            distance = self._haversine_distance(lat, lon, node[0], node[1])
-            if distance < min_distance:
-                min_distance = distance
-                nearest_node = node
+        dist, predecessors = self._road_sssp(start_idx, 'bike' if mode == 'bike' else 'walk')
+        if not np.isfinite(dist[end_idx]):
+            return None
         
-        return nearest_node
+        # predecessor를 따라 경로 복원
+        path_idx = [end_idx]
+        while path_idx[-1] != start_idx:
+            path_idx.append(int(predecessors[path_idx[-1]]))
+        return [self._road_nodes[i] for i in reversed(path_idx)]
+    
+    def _build_road_csr(self):
+        """도로 그래프를 CSR 인접행렬로 변환 (노드 순서는 self._road_nodes)"""
+        import networkx as nx
+        self._road_node_index = {node: i for i, node in enumerate(self._road_nodes)}
+        self._road_csr = {
+            'walk': nx.to_scipy_sparse_array(self.road_graph, nodelist=self._road_nodes,
+                                             weight=None, format='csr'),
+            'bike': nx.to_scipy_sparse_array(self.road_graph, nodelist=self._road_nodes,
+                                             weight='distance', format='csr')
+        }
+        self._reset_road_sssp_cache()
+    
+    def _reset_road_sssp_cache(self):
+        """SSSP 캐시를 CSR 행렬과 함께 새로 만든다 (행렬이 바뀌면 이전 배열을 함께 버림)"""
+        self._road_sssp = lru_cache(maxsize=32)(self._compute_road_sssp)
+    
+    def _compute_road_sssp(self, start_idx: int, mode: str) -> Tuple[np.ndarray, np.ndarray]:
+        """출발 노드 기준 전체 최단거리/선행노드 (_road_sssp로 캐시, 같은 출발지의 여러 목적지 재사용)"""
+        from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+        return csgraph_dijkstra(self._road_csr[mode], directed=True,
+                                indices=start_idx, return_predecessors=True)
     
-    def _find_closest_point_index(self, target: Tuple[float, float], 
-                                 path: List[Tuple[float, float]]) -> Optional[int]:
-        """경로에서 목표점에 가장 가까운 지점의 인덱스 찾기"""
-        if not path:
+    def _find_nearest_graph_node(self, point: Tuple[float, float]) -> Optional[Tuple[float, float]]:
+        """그래프에서 가장 가까운 노드 찾기 (BallTree, 없으면 전체 노드 일괄 거리 계산)"""
+        if len(self._road_nodes) == 0:
             return None
         
-        min_distance = float('inf')
-        closest_idx = 0
+        lat, lon = point
+        if self._node_tree is not None:
+            _, idx = self._node_tree.query(np.radians([[lat, lon]]), k=1)
+            return self._road_nodes[int(idx[0, 0])]
         
-        for i, point in enumerate(path):
-            distance = self._haversine_distance(target[0], target[1], point[0], point[1])
-            if distance < min_distance:
-                min_distance = distance
-                closest_idx = i
+        distances = _haversine_vec(lat, lon, self._node_lat, self._node_lon)
+        return self._road_nodes[int(np.argmin(distances))]
+    
+    def _find_closest_point_index(self, target: Tuple[float, float], path) -> Optional[int]:
+        """경로 (좌표 목록 또는 (K, 2) 배열)에서 목표점에 가장 가까운 지점의 인덱스 찾기"""
+        if len(path) == 0:
+            return None
         
-        return closest_idx
+        path_arr = np.asarray(path, dtype=np.float64)
+        distances = _haversine_vec(target[0], target[1], path_arr[:, 0], path_arr[:, 1])
+        return int(np.argmin(distances))
     
     def _calculate_path_distance(self, path: List[Tuple[float, float]]) -> float:
         """경로의 총 거리 계산 (km)"""
         if len(path) < 2:
             return 0.0
         
-        total_distance = 0.0
-        for i in range(len(path) - 1):
-            distance = self._haversine_distance(
-                path[i][0], path[i][1],
-                path[i+1][0], path[i+1][1]
-            )
-            total_distance += distance
-        
-        return round(total_distance, 3)
+        path_arr = np.asarray(path, dtype=np.float64)
+        distances = _haversine_vec(path_arr[:-1, 0], path_arr[:-1, 1], path_arr[1:, 0], path_arr[1:, 1])
+        return round(float(distances.sum()), 3)
     
     def _haversine_distance(self, lat1: float, lon1: float, 
                            lat2: float, lon2: float) -> float:
@@ -635,7 +1472,6 @@ class GangnamRAPTORVisualizer:
         lat1_rad = math.radians(lat1)
         lat2_rad = math.radians(lat2)
         delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians
         delta_lon = math.radians(lon2 - lon1)
         
         a = (math.sin(delta_lat/2)**2 + 
@@ -662,6 +1498,8 @@ class GangnamRAPTORVisualizer:
                              origin_coords: Tuple[float, float],
                              dest_coords: Tuple[float, float]) -> folium.Map:
         """대화형 웹 지도 생성"""
+        import folium
+        import folium.plugins as plugins
         print("🗺️ 대화형 지도 생성 중...")
         
         # 지도 초기화 (강남구 중심)
@@ -701,22 +1539,27 @@ class GangnamRAPTORVisualizer:
             icon=folium.Icon(color='red', icon='stop')
         ).add_to(m)
         
-        # 각 경로별 레이어 그룹 생성
+        # 각 경로별 레이어 그룹 생성 (세그먼트가 많으면 경로선을 벡터 타일로)
         journey_groups = {}
+        total_segments = sum(len(journey.segments) for journey in visualization_journeys)
+        use_vector_tiles = total_segments >= self.VECTOR_TILE_MIN_SEGMENTS
         
         for journey in visualization_journeys:
             group_name = f"경로 {journey.journey_id} ({journey.journey_type.upper()})"
             journey_group = folium.FeatureGroup(name=group_name, show=True)
             
-            # 경로 세그먼트들 추가
+            # 경로 세그먼트들을 레이어 하나에 모아 추가
+            segment_layer = _segment_layer_class()(vector_tiles=use_vector_tiles)
             for i, segment in enumerate(journey.segments):
-                self._add_segment_to_map(journey_group, segment, journey.journey_id, i)
-            
+                self._add_segment_to_map(segment_layer, segment, journey.journey_id, i)
+            journey_group.add_child(segment_layer)
+
             journey_groups[journey.journey_id] = journey_group
             m.add_child(journey_group)
         
         # 교통 인프라 레이어
-        self._add_infrastructure_layers(m)
+        if self.show_infrastructure:
+            self._add_infrastructure_layers(m)
         
         # 경로 정보 패널
         self._add_journey_info_panel(m, visualization_journeys)
@@ -737,10 +1580,9 @@ class GangnamRAPTORVisualizer:
         print("✅ 대화형 지도 생성 완료")
         return m
     
-    def _add_segment_to_map(self, group: folium.FeatureGroup, segment: VisualizationSegment,
+    def _add_segment_to_map(self, layer, segment: VisualizationSegment,
                            journey_id: int, segment_id: int):
-        """지도에 경로 세그먼트 추가"""
-        
+        """경로 세그먼트의 경로선/마커를 여행 레이어(SegmentLayer)에 추가"""
         if len(segment.coordinates) < 2:
             return
         
@@ -758,146 +1600,106 @@ class GangnamRAPTORVisualizer:
             line_weight = 3
             opacity = 0.6
         
-        # 애니메이션 효과를 위한 경로선
-        folium.PolyLine(
-            locations=segment.coordinates,
-            color=segment.color,
-            weight=line_weight,
-            opacity=opacity,
-            popup=self._create_segment_popup(segment, journey_id, segment_id),
-            tooltip=f"{segment.route_name} ({segment.duration}분)"
-        ).add_to(group)
+        # 경로선 (좌표는 encoded polyline으로 싣고 브라우저에서 복원)
+        # 방향 화살표는 긴 세그먼트에만, 경로선에 직접 표시
+        layer.lines.append({
+            'encoded': segment.encoded_polyline or _encode_polyline(segment.coordinates),
+            'options': {'color': segment.color, 'weight': line_weight, 'opacity': opacity},
+            'popup': self._segment_popup_data(segment, journey_id, segment_id),
+            'tooltip': f"{segment.route_name} ({segment.duration}분)",
+            'arrows': len(segment.coordinates) > 3
+        })
+        
+        start_point = [float(segment.start_point[0]), float(segment.start_point[1])]
         
         # 시작점 마커 (첫 번째 세그먼트만)
         if segment_id == 0:
-            folium.CircleMarker(
-                location=segment.start_point,
-                radius=8,
-                popup=f"🚀 여행 {journey_id} 시작",
-                color=segment.color,
-                fillColor=segment.color,
-                fillOpacity=0.8
-            ).add_to(group)
+            layer.markers.append({
+                'location': start_point,
+                'popup': f"🚀 여행 {journey_id} 시작",
+                'options': {'radius': 8, 'color': segment.color,
+                            'fillColor': segment.color, 'fillOpacity': 0.8}
+            })
         
         # 환승/전환점 마커
         if segment.mode == 'transit':
-            folium.CircleMarker(
-                location=segment.start_point,
-                radius=6,
-                popup=f"🚇 {segment.route_name}",
-                color=segment.color,
-                fillColor='white',
-                fillOpacity=1.0
-            ).add_to(group)
+            layer.markers.append({
+                'location': start_point,
+                'popup': f"🚇 {segment.route_name}",
+                'options': {'radius': 6, 'color': segment.color,
+                            'fillColor': 'white', 'fillOpacity': 1.0}
+            })
         elif segment.mode in ['bike_rental', 'bike_return']:
             icon_symbol = '🚲' if segment.mode == 'bike_rental' else '🔄'
-            folium.Marker(
-                location=segment.start_point,
-                popup=f"{icon_symbol} {segment.route_name}",
-                tooltip=segment.route_name,
-                icon=folium.DivIcon(
-                    html=f'<div style="font-size: 20px;">{icon_symbol}</div>',
-                    class_name='bike-marker'
-                )
-            ).add_to(group)
-        
-        # 방향 화살표 (긴 세그먼트에만)
-        if len(segment.coordinates) > 3:
-            mid_point = segment.coordinates[len(segment.coordinates)//2]
-            plugins.PolyLineTextPath(
-                folium.PolyLine(segment.coordinates, opacity=0),
-                "    ►    ",
-                repeat=True,
-                offset=7,
-                attributes={'fill': segment.color, 'font-weight': 'bold'}
-            ).add_to(group)
-    
-    def _create_segment_popup(self, segment: VisualizationSegment, 
-                             journey_id: int, segment_id: int) -> str:
-        """세그먼트 팝업 HTML 생성"""
-        
-        mode_icons = {
-            'walk': '🚶‍♂️',
-            'bike': '🚲',
-            'transit': '🚇',
-            'bike_rental': '🔄',
-            'bike_return': '🔄'
-        }
-        
-        icon = mode_icons.get(segment.mode, '🚌')
-        
-        popup_html = f"""
-        <div style="width: 250px; font-family: Arial, sans-serif;">
-            <h4 style="margin: 0; color: {segment.color};">
-                {icon} {segment.route_name}
-            </h4>
-            <hr style="margin: 5px 0;">
-            <p style="margin: 5px 0;"><b>경로:</b> {journey_id}, 구간: {segment_id + 1}</p>
-            <p style="margin: 5px 0;"><b>소요시간:</b> {segment.duration}분</p>
-            <p style="margin: 5px 0;"><b>거리:</b> {segment.distance:.2f}km</p>
-            <p style="margin: 5px 0;"><b>요금:</b> {segment.cost:,.0f}원</p>
-        </div>
-        """
+            layer.markers.append({
+                'location': start_point,
+                'popup': f"{icon_symbol} {segment.route_name}",
+                'tooltip': segment.route_name,
+                'icon_html': f'<div style="font-size: 20px;">{icon_symbol}</div>'
+            })
+    
+    def _segment_popup_data(self, segment: VisualizationSegment,
+                            journey_id: int, segment_id: int) -> Dict[str, Any]:
+        """세그먼트 팝업 데이터 (HTML은 팝업을 열 때 브라우저에서 segmentPopupHtml()로 생성)"""
         
-        return popup_html
+        return {
+            'icon': _MODE_EMOJIS.get(segment.mode, '🚌'),
+            'route_name': segment.route_name,
+            'color': segment.color,
+            'journey_id': journey_id,
+            'segment_no': segment_id + 1,
+            'duration': segment.duration,
+            'distance': float(segment.distance),
+            'cost': float(segment.cost)
+        }
     
     def _add_infrastructure_layers(self, m: folium.Map):
         """교통 인프라 레이어 추가"""
+        import folium
+        
+        CanvasPointLayer = _canvas_point_layer_class()
         
         # 지하철역 레이어
         subway_group = folium.FeatureGroup(name="🚇 지하철역", show=False)
-        
-        for stop_id, stop_data in self.stops.items():
-            # 지하철역 판별 (노선 정보 기반)
-            is_subway = any(
-                route_data.get('type', 3) == 1 
-                for route_data in self.routes.values()
-            )
-            
-            if is_subway:
-                folium.CircleMarker(
-                    location=(stop_data['lat'], stop_data['lon']),
-                    radius=4,
-                    popup=f"🚇 {stop_data['name']}",
-                    tooltip=stop_data['name'],
-                    color='blue',
-                    fillColor='lightblue',
-                    fillOpacity=0.7
-                ).add_to(subway_group)
-        
+        subway_points = [
+            [stop_data['lat'], stop_data['lon'], str(stop_data['name'])]
+            for stop_id, stop_data in self.stops.items()
+            # 지하철역 판별 (정류장을 지나는 노선 중 지하철(route_type 1)이 있는지)
+            if 1 in self._stop_route_types.get(stop_id, ())
+        ]
+        subway_group.add_child(CanvasPointLayer(
+            subway_points, popup_prefix='🚇 ',
+            cluster=len(subway_points) >= self.INFRA_CLUSTER_MIN_POINTS,
+            radius=4, color='blue', fillColor='lightblue', fillOpacity=0.7
+        ))
         m.add_child(subway_group)
         
         # 따릉이 대여소 레이어
         bike_group = folium.FeatureGroup(name="🚲 따릉이 대여소", show=False)
-        
-        for station_id, station_data in self.bike_stations.items():
-            folium.CircleMarker(
-                location=(station_data['lat'], station_data['lon']),
-                radius=3,
-                popup=f"🚲 {station_data['name']}",
-                tooltip=station_data['name'],
-                color='orange',
-                fillColor='yellow',
-                fillOpacity=0.6
-            ).add_to(bike_group)
-        
+        bike_points = [
+            [station_data['lat'], station_data['lon'], str(station_data['name'])]
+            for station_data in self.bike_stations.values()
+        ]
+        bike_group.add_child(CanvasPointLayer(
+            bike_points, popup_prefix='🚲 ',
+            cluster=len(bike_points) >= self.INFRA_CLUSTER_MIN_POINTS,
+            radius=3, color='orange', fillColor='yellow', fillOpacity=0.6
+        ))
         m.add_child(bike_group)
     
     def _add_journey_info_panel(self, m: folium.Map, journeys: List[VisualizationJourney]):
         """경로 정보 패널 추가"""
+        from branca.element import Element
         
         info_html = self._generate_journey_info_html(journeys)
         
-        # 정보 패널을 우측 상단에 추가
-        info_panel = folium.plugins.FloatImage(
-            image=self._html_to_image(info_html),
-            bottom=70,
-            left=85
-        )
-        m.add_child(info_panel)
+        # 정보 패널을 우측 상단에 고정 위치 HTML로 추가
+        m.get_root().html.add_child(Element(
+            f"<div style='position: fixed; top: 70px; right: 85px; z-index: 9999;'>{info_html}</div>"
+        ))
     
     def _generate_journey_info_html(self, journeys: List[VisualizationJourney]) -> str:
-        """경로 정보 HTML 생성"""
+        """경로 정보 HTML 생성 (여행별 블록은 _journey_info_block_html에 캐시)"""
         
         html = """
         <div style='background: white; padding: 15px; border-radius: 10px; 
@@ -906,92 +1708,87 @@ class GangnamRAPTORVisualizer:
             <h3 style='margin: 0 0 10px 0; color: #333;'>🗺️ 경로 요약</h3>
         """
         
-        for journey in journeys:
-            # 경로 타입별 이모지
-            type_emoji = {
-                'walk': '🚶‍♂️',
-                'bike': '🚲', 
-                'transit': '🚇',
-                'mixed': '🔄'
-            }.get(journey.journey_type, '🚌')
-            
-            html += f"""
-            <div style='margin: 8px 0; padding: 8px; background: #f8f9fa; border-radius: 5px;'>
-                <div style='font-weight: bold; color: #495057;'>
-                    {type_emoji} 경로 {journey.journey_id}
-                </div>
-                <div style='margin: 3px 0;'>
-                    ⏱️ {journey.total_time//60}시간 {journey.total_time%60}분
-                </div>
-                <div style='margin: 3px 0;'>
-                    💰 {journey.total_cost:,.0f}원
-                </div>
-                <div style='margin: 3px 0;'>
-                    📏 {journey.summary_stats['total_distance_km']}km
-                </div>
-                <div style='margin: 3px 0; font-size: 10px; color: #6c757d;'>
-                    {len(journey.segments)}개 구간
-                </div>
-            </div>
-            """
+        html += "".join(
+            _journey_info_block_html(
+                journey.journey_id, journey.journey_type, journey.total_time,
+                journey.total_cost, journey.summary_stats['total_distance_km'],
+                len(journey.segments)
+            )
+            for journey in journeys
+        )
         
         html += "</div>"
         return html
     
-    def _html_to_image(self, html: str) -> str:
-        """HTML을 이미지로 변환 (간단한 버전)"""
-        # 실제 구현에서는 HTML을 이미지로 변환하는 라이브러리 사용
-        # 여기서는 단순화된 버전으로 base64 인코딩된 투명 이미지 반환
-        return "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/5+hHgAHggJ/PchI7wAAAABJRU5ErkJggg=="
-    
     # =============================================================================
     # 정적 시각화 (Plotly)
     # =============================================================================
     
     def create_plotly_visualization(self, visualization_journeys: List[VisualizationJourney]) -> go.Figure:
         """Plotly를 이용한 정적 시각화"""
+        import plotly.graph_objects as go
         print("📊 Plotly 시각화 생성 중...")
         
+        # 그릴 경로선(좌표 2개 이상 세그먼트)이 없으면 빈 그림만 반환
+        if not any(len(segment.coordinates) >= 2
+                   for journey in visualization_journeys for segment in journey.segments):
+            print("⚠️ 시각화할 경로가 없습니다.")
+            return go.Figure(layout=dict(title="강남구 Multi-modal RAPTOR 경로 시각화", title_x=0.5))
+        
         fig = go.Figure()
         
         # 강남구 경계 추가
         self._add_gangnam_boundary(fig)
         
-        # 각 경로 추가
+        # 각 경로 추가 (선 굵기/색이 같은 세그먼트는 NaN 구분 트레이스 하나로 묶음)
+        # 한 번의 순회로 스타일별 좌표/customdata 버퍼를 채움 (구간 사이에 NaN 점)
+        line_widths = {'transit': 4, 'walk': 2, 'bike': 3}
+        gap = np.full(1, np.nan)
+        gap_info = [None] * 4
+        buffers = {}
         for journey in visualization_journeys:
-            for i, segment in enumerate(journey.segments):
-                if len(segment.coordinates) >= 2:
-                    lats, lons = zip(*segment.coordinates)
-                    
-                    # 모드별 스타일 설정
-                    if segment.mode == 'transit':
-                        line_width = 4
-                        line_color = segment.color
-                    elif segment.mode == 'walk':
-                        line_width = 2
-                        line_color = segment.color
-                    elif segment.mode == 'bike':
-                        line_width = 3
-                        line_color = segment.color
-                    else:
-                        line_width = 2
-                        line_color = segment.color
-                    
-                    fig.add_trace(go.Scattermapbox(
-                        lat=lats,
-                        lon=lons,
-                        mode='lines',
-                        line=dict(width=line_width, color=segment.color, ),
-                        name=f"경로{journey.journey_id}-{segment.route_name}",
-                        hovertemplate=f"<b>{segment.route_name}</b><br>" +
-                                    f"소요시간: {segment.duration}분<br>" +
-                                    f"거리: {segment.distance:.2f}km<br>" +
-                                    f"요금: {segment.cost:,.0f}원<extra></extra>",
-                        showlegend=True
-                    ))
+            for segment in journey.segments:
+                coordinates = segment.coordinates
+                if len(coordinates) < 2:
+                    continue
+                style = (line_widths.get(segment.mode, 2), segment.color)
+                buffer = buffers.get(style)
+                if buffer is None:
+                    buffer = buffers[style] = {'lats': [], 'lons': [], 'customdata': [], 'names': {}}
+                else:
+                    buffer['lats'].append(gap)
+                    buffer['lons'].append(gap)
+                    buffer['customdata'].append(gap_info)
+                route_name = segment.route_name
+                buffer['lats'].append(coordinates[:, 0])
+                buffer['lons'].append(coordinates[:, 1])
+                # 점마다 세그먼트 정보
+                buffer['customdata'].extend(
+                    [[route_name, segment.duration, segment.distance, segment.cost]] * len(coordinates))
+                buffer['names'][route_name] = None
+        
+        for (line_width, color), buffer in buffers.items():
+            lats = np.concatenate(buffer['lats'])
+            lons = np.concatenate(buffer['lons'])
+            customdata = buffer['customdata']
+            
+            fig.add_trace(go.Scattermapbox(
+                lat=lats,
+                lon=lons,
+                mode='lines',
+                line=dict(width=line_width, color=color),
+                name=' / '.join(buffer['names']),
+                customdata=customdata,
+                hovertemplate="<b>%{customdata[0]}</b><br>" +
+                              "소요시간: %{customdata[1]}분<br>" +
+                              "거리: %{customdata[2]:.2f}km<br>" +
+                              "요금: %{customdata[3]:,.0f}원<extra></extra>",
+                showlegend=True
+            ))
         
         # 교통 인프라 추가
-        self._add_infrastructure_to_plotly(fig)
+        if self.show_infrastructure:
+            self._add_infrastructure_to_plotly(fig)
         
         # 레이아웃 설정
         fig.update_layout(
@@ -1019,6 +1816,7 @@ class GangnamRAPTORVisualizer:
     
     def _add_gangnam_boundary(self, fig: go.Figure):
         """강남구 경계 추가"""
+        import plotly.graph_objects as go
         # 강남구 대략적 경계
         boundary_coords = [
             (37.46, 127.00), (37.46, 127.14),
@@ -1040,6 +1838,7 @@ class GangnamRAPTORVisualizer:
     
     def _add_infrastructure_to_plotly(self, fig: go.Figure):
         """교통 인프라를 Plotly에 추가"""
+        import plotly.graph_objects as go
         
         # 주요 지하철역 추가
         major_stations = {
@@ -1049,16 +1848,19 @@ class GangnamRAPTORVisualizer:
             '삼성역': (37.508847, 127.063804)
         }
         
-        for station_name, (lat, lon) in major_stations.items():
-            fig.add_trace(go.Scattermapbox(
-                lat=[lat],
-                lon=[lon],
-                mode='markers',
-                marker=dict(size=10, color='blue', symbol='rail'),
-                name=f"🚇 {station_name}",
-                hovertemplate=f"<b>🚇 {station_name}</b><extra></extra>",
-                showlegend=False
-            ))
+        # 역 전체를 마커 트레이스 하나로
+        station_names = list(major_stations)
+        station_coords = np.array(list(major_stations.values()))
+        fig.add_trace(go.Scattermapbox(
+            lat=station_coords[:, 0],
+            lon=station_coords[:, 1],
+            mode='markers',
+            marker=dict(size=10, color='blue', symbol='rail'),
+            name="🚇 주요 지하철역",
+            customdata=station_names,
+            hovertemplate="<b>🚇 %{customdata}</b><extra></extra>",
+            showlegend=False
+        ))
     
     # =============================================================================
     # 경로 비교 및 통계 분석
@@ -1066,17 +1868,19 @@ class GangnamRAPTORVisualizer:
     
     def create_journey_comparison_chart(self, visualization_journeys: List[VisualizationJourney]) -> go.Figure:
         """경로 비교 차트 생성"""
+        import plotly.graph_objects as go
         print("📊 경로 비교 차트 생성 중...")
         
         if not visualization_journeys:
             return go.Figure()
         
-        # 데이터 준비
-        journey_ids = [j.journey_id for j in visualization_journeys]
-        journey_types = [j.journey_type for j in visualization_journeys]
-        times = [j.total_time for j in visualization_journeys]
-        costs = [j.total_cost for j in visualization_journeys]
-        distances = [j.summary_stats['total_distance_km'] for j in visualization_journeys]
+        # 데이터 준비 (컬렉션에 미리 추출된 배열 재사용)
+        collection = JourneyCollection.wrap(visualization_journeys)
+        journey_ids = collection.journey_ids
+        journey_types = collection.journey_types
+        times = collection.times
+        costs = collection.costs
+        distances = collection.distances
         
         # 서브플롯 생성
         from plotly.subplots import make_subplots
@@ -1098,7 +1902,7 @@ class GangnamRAPTORVisualizer:
                 y=times,
                 name='소요시간(분)',
                 marker_color=colors[0],
-                text=[f"{t}분" for t in times],
+                text=[f"{t}분" for t in times.tolist()],
                 textposition='auto'
             ),
             row=1, col=1
@@ -1111,7 +1915,7 @@ class GangnamRAPTORVisualizer:
                 y=costs,
                 name='요금(원)',
                 marker_color=colors[1],
-                text=[f"{c:,.0f}원" for c in costs],
+                text=[f"{c:,.0f}원" for c in costs.tolist()],
                 textposition='auto'
             ),
             row=1, col=2
@@ -1124,15 +1928,16 @@ class GangnamRAPTORVisualizer:
                 y=distances,
                 name='거리(km)',
                 marker_color=colors[2],
-                text=[f"{d:.1f}km" for d in distances],
+                text=[f"{d:.1f}km" for d in distances.tolist()],
                 textposition='auto'
             ),
             row=2, col=1
         )
         
         # 4. 효율성 분석 (시간당 비용)
-        efficiency = [c/t*60 if t > 0 else 0 for c, t in zip(costs, times)]  # 시간당 비용
-        speed = [d/t*60 if t > 0 else 0 for d, t in zip(distances, times)]   # 평균 속도
+        moving = times > 0
+        efficiency = np.divide(costs, times, out=np.zeros(len(times)), where=moving) * 60  # 시간당 비용
+        speed = np.divide(distances, times, out=np.zeros(len(times)), where=moving) * 60   # 평균 속도
         
         fig.add_trace(
             go.Scatter(
@@ -1193,77 +1998,56 @@ class GangnamRAPTORVisualizer:
             'efficiency_rankings': []
         }
         
-        # 기본 통계
-        times = [j.total_time for j in visualization_journeys]
-        costs = [j.total_cost for j in visualization_journeys]
-        distances = [j.summary_stats['total_distance_km'] for j in visualization_journeys]
-        
-        stats['time_stats'] = {
-            'min': min(times),
-            'max': max(times),
-            'avg': sum(times) / len(times),
-            'median': sorted(times)[len(times)//2]
-        }
-        
-        stats['cost_stats'] = {
-            'min': min(costs),
-            'max': max(costs),
-            'avg': sum(costs) / len(costs),
-            'median': sorted(costs)[len(costs)//2]
-        }
-        
-        stats['distance_stats'] = {
-            'min': min(distances),
-            'max': max(distances),
-            'avg': sum(distances) / len(distances),
-            'median': sorted(distances)[len(distances)//2]
-        }
-        
-        # 경로 타입별 분석
-        for journey in visualization_journeys:
-            journey_type = journey.journey_type
-            if journey_type not in stats['journey_types']:
-                stats['journey_types'][journey_type] = {
-                    'count': 0,
-                    'avg_time': 0,
-                    'avg_cost': 0,
-                    'avg_distance': 0
-                }
-            
-            type_stats = stats['journey_types'][journey_type]
-            type_stats['count'] += 1
-            type_stats['avg_time'] += journey.total_time
-            type_stats['avg_cost'] += journey.total_cost
-            type_stats['avg_distance'] += journey.summary_stats['total_distance_km']
-        
-        # 평균값 계산
-        for journey_type, type_stats in stats['journey_types'].items():
-            count = type_stats['count']
-            type_stats['avg_time'] /= count
-            type_stats['avg_cost'] /= count
-            type_stats['avg_distance'] /= count
-        
-        # 모드 분석
-        all_modes = []
-        for journey in visualization_journeys:
-            all_modes.extend(journey.summary_stats['modes_used'])
-        
-        from collections import Counter
-        mode_counts = Counter(all_modes)
-        stats['mode_analysis'] = dict(mode_counts)
+        # 기본 통계 (컬렉션에 미리 추출된 배열 재사용)
+        collection = JourneyCollection.wrap(visualization_journeys)
+        times, costs, distances = collection.times, collection.costs, collection.distances
+        n = len(collection)
+        
+        def summarize(values: np.ndarray) -> Dict[str, Any]:
+            # 중앙값은 기존과 같이 정렬 후 n//2 번째 값 (전체 정렬 대신 partition)
+            return {
+                'min': values.min().item(),
+                'max': values.max().item(),
+                'avg': values.sum().item() / n,
+                'median': np.partition(values, n // 2)[n // 2].item()
+            }
+        
+        stats['time_stats'] = summarize(times)
+        stats['cost_stats'] = summarize(costs)
+        stats['distance_stats'] = summarize(distances)
+        
+        # 경로 타입별 분석 (등장 순서대로 그룹 번호 → bincount 합계)
+        type_codes, journey_types = pd.factorize(
+            pd.Series(collection.journey_types, dtype=object))
+        type_counts = np.bincount(type_codes)
+        type_sums = [np.bincount(type_codes, weights=values) for values in (times, costs, distances)]
+        for k, journey_type in enumerate(journey_types):
+            count = int(type_counts[k])
+            stats['journey_types'][journey_type] = {
+                'count': count,
+                'avg_time': type_sums[0][k].item() / count,
+                'avg_cost': type_sums[1][k].item() / count,
+                'avg_distance': type_sums[2][k].item() / count
+            }
+        
+        # 모드 분석 (등장 순서 유지)
+        all_modes = [mode for journey in visualization_journeys for mode in journey.summary_stats['modes_used']]
+        if all_modes:
+            mode_codes, modes = pd.factorize(pd.Series(all_modes, dtype=object))
+            stats['mode_analysis'] = dict(zip(modes.tolist(), np.bincount(mode_codes).tolist()))
         
         # 효율성 순위
-        for journey in visualization_journeys:
-            efficiency_score = journey.total_time * 0.6 + (journey.total_cost / 1000) * 0.4
-            stats['efficiency_rankings'].append({
-                'journey_id': journey.journey_id,
-                'journey_type': journey.journey_type,
-                'efficiency_score': efficiency_score,
-                'total_time': journey.total_time,
-                'total_cost': journey.total_cost
-            })
-        
-        stats['efficiency_rankings'].sort(key=lambda x: x['efficiency_score'])
+        efficiency_scores = collection.efficiency
+        stats['efficiency_rankings'] = [
+            {
+                'journey_id': visualization_journeys[i].journey_id,
+                'journey_type': visualization_journeys[i].journey_type,
+                'efficiency_score': efficiency_scores[i].item(),
+                'total_time': visualization_journeys[i].total_time,
+                'total_cost': visualization_journeys[i].total_cost
+            }
+            for i in np.argsort(efficiency_scores, kind='stable').tolist()
+        ]
         
         return stats
     
@@ -1273,8 +2057,9 @@ class GangnamRAPTORVisualizer:
     
     def visualize_all_journeys(self, origin_lat: float, origin_lon: float,
                               dest_lat: float, dest_lon: float,
-                              save_path: str = "visualization_results") -> Dict[str, Any]:
-        """모든 경로 시각화 실행"""
+                              save_path: str = "visualization_results",
+                              save_png: bool = False) -> Dict[str, Any]:
+        """모든 경로 시각화 실행 (save_png=True일 때만 Kaleido로 정적 PNG 저장)"""
         print(f"\n🎨 강남구 Multi-modal RAPTOR 경로 시각화 시작")
         print(f"   출발지: ({origin_lat:.6f}, {origin_lon:.6f})")
         print(f"   목적지: ({dest_lat:.6f}, {dest_lon:.6f})")
@@ -1290,6 +2075,7 @@ class GangnamRAPTORVisualizer:
         for journey_data in self.journey_results:
             viz_journey = self.generate_accurate_route_coordinates(journey_data)
             visualization_journeys.append(viz_journey)
+        visualization_journeys = JourneyCollection(visualization_journeys)
         
         print(f"✅ {len(visualization_journeys)}개 경로 좌표 생성 완료")
         
@@ -1317,7 +2103,7 @@ class GangnamRAPTORVisualizer:
         print(f"\n6️⃣ 결과 저장: {save_path}/")
         results = self._save_visualization_results(
             visualization_journeys, interactive_map, plotly_fig, 
-            comparison_chart, statistics, save_path
+            comparison_chart, statistics, save_path, save_png
         )
         
         print("\n🎉 강남구 Multi-modal RAPTOR 경로 시각화 완료!")
@@ -1328,8 +2114,9 @@ class GangnamRAPTORVisualizer:
                                    plotly_fig: go.Figure,
                                    comparison_chart: go.Figure,
                                    statistics: Dict,
-                                   save_path: str) -> Dict[str, Any]:
-        """시각화 결과 저장"""
+                                   save_path: str,
+                                   save_png: bool = False) -> Dict[str, Any]:
+        """시각화 결과 저장 (산출물마다 따로 저장, 하나가 실패해도 나머지는 계속 저장)"""
         
         save_dir = Path(save_path)
         save_dir.mkdir(exist_ok=True)
@@ -1340,42 +2127,7 @@ class GangnamRAPTORVisualizer:
             'file_paths': {}
         }
         
-        try:
-            # 1. 대화형 지도 저장
-            map_path = save_dir / 'interactive_route_map.html'
-            interactive_map.save(str(map_path))
-            results['file_paths']['interactive_map'] = str(map_path)
-            print(f"   ✅ 대화형 지도: {map_path}")
-            
-            # 2. Plotly 시각화 저장
-            plotly_path = save_dir / 'route_visualization.html'
-            plotly_fig.write_html(str(plotly_path))
-            results['file_paths']['plotly_visualization'] = str(plotly_path)
-            print(f"   ✅ Plotly 시각화: {plotly_path}")
-            
-            # 3. 경로 비교 차트 저장
-            comparison_path = save_dir / 'route_comparison.html'
-            comparison_chart.write_html(str(comparison_path))
-            results['file_paths']['comparison_chart'] = str(comparison_path)
-            print(f"   ✅ 경로 비교 차트: {comparison_path}")
-            
-            # 4. 정적 이미지 저장 (PNG)
-            try:
-                png_path = save_dir / 'route_visualization.png'
-                plotly_fig.write_image(str(png_path), width=1200, height=800)
-                results['file_paths']['static_image'] = str(png_path)
-                print(f"   ✅ 정적 이미지: {png_path}")
-            except Exception as e:
-                print(f"   ⚠️ PNG 저장 실패: {e}")
-            
-            # 5. 통계 데이터 저장
-            stats_path = save_dir / 'route_statistics.json'
-            with open(stats_path, 'w', encoding='utf-8') as f:
-                json.dump(statistics, f, indent=2, ensure_ascii=False, default=str)
-            results['file_paths']['statistics'] = str(stats_path)
-            print(f"   ✅ 통계 데이터: {stats_path}")
-            
-            # 6. 시각화 경로 데이터 저장
+        def write_visualization_data(viz_path: Path):
             viz_data = []
             for journey in journeys:
                 journey_data = {
@@ -1404,35 +2156,71 @@ class GangnamRAPTORVisualizer:
                 
                 viz_data.append(journey_data)
             
-            viz_path = save_dir / 'visualization_data.json'
-            with open(viz_path, 'w', encoding='utf-8') as f:
-                json.dump(viz_data, f, indent=2, ensure_ascii=False)
-            results['file_paths']['visualization_data'] = str(viz_path)
-            print(f"   ✅ 시각화 데이터: {viz_path}")
-            
-            # 7. GeoJSON 저장
-            geojson_data = self._create_geojson_from_journeys(journeys)
-            geojson_path = save_dir / 'routes.geojson'
-            with open(geojson_path, 'w', encoding='utf-8') as f:
-                json.dump(geojson_data, f, indent=2)
-            results['file_paths']['geojson'] = str(geojson_path)
-            print(f"   ✅ GeoJSON: {geojson_path}")
-            
-            # 8. 요약 리포트 생성
-            report_path = save_dir / 'visualization_report.html'
-            self._generate_html_report(journeys, statistics, report_path)
-            results['file_paths']['report'] = str(report_path)
-            print(f"   ✅ 요약 리포트: {report_path}")
+            with open(viz_path, 'wb') as f:
+                f.write(json_bytes(viz_data))
+        
+        # (file_paths 키, 로그 이름, 파일 경로, 저장 함수) - 기존 저장 순서 (PNG는 경로 비교 차트 다음)
+        save_tasks = [
+            ('interactive_map', '대화형 지도', save_dir / 'interactive_route_map.html',
+             lambda path: interactive_map.save(str(path))),
+            ('plotly_visualization', 'Plotly 시각화', save_dir / 'route_visualization.html',
+             lambda path: plotly_fig.write_html(str(path))),
+            ('comparison_chart', '경로 비교 차트', save_dir / 'route_comparison.html',
+             lambda path: comparison_chart.write_html(str(path))),
+            ('statistics', '통계 데이터', save_dir / 'route_statistics.json',
+             lambda path: path.write_bytes(json_bytes(statistics, indent=True, default=str))),
+            ('visualization_data', '시각화 데이터', save_dir / 'visualization_data.json',
+             write_visualization_data),
+            ('geojson', 'GeoJSON', save_dir / 'routes.geojson',
+             lambda path: self._write_geojson_from_journeys(journeys, path)),
+            ('report', '요약 리포트', save_dir / 'visualization_report.html',
+             lambda path: self._generate_html_report(journeys, statistics, path))
+        ]
+        
+        for key, label, path, save in save_tasks:
+            try:
+                save(path)
+            except Exception as e:
+                print(f"   ❌ {label} 저장 실패: {e}")
+                continue
+            results['file_paths'][key] = str(path)
+            print(f"   ✅ {label}: {path}")
             
-        except Exception as e:
-            print(f"   ❌ 저장 중 오류: {e}")
+            if key != 'comparison_chart':
+                continue
+            # 정적 이미지 저장 (PNG) - Kaleido가 headless Chromium을 띄우므로 요청 시에만
+            if save_png:
+                try:
+                    png_path = save_dir / 'route_visualization.png'
+                    plotly_fig.write_image(str(png_path), width=1200, height=800)
+                    results['file_paths']['static_image'] = str(png_path)
+                    print(f"   ✅ 정적 이미지: {png_path}")
+                except Exception as e:
+                    print(f"   ⚠️ PNG 저장 실패: {e}")
+            else:
+                print("   ⏭️ 정적 이미지 생략 (save_png=False)")
         
         return results
     
     def _create_geojson_from_journeys(self, journeys: List[VisualizationJourney]) -> Dict:
         """경로를 GeoJSON 형식으로 변환"""
-        features = []
-        
+        return {
+            "type": "FeatureCollection",
+            "features": list(self._iter_geojson_features(journeys))
+        }
+    
+    def _write_geojson_from_journeys(self, journeys: List[VisualizationJourney], path: Path):
+        """GeoJSON을 피처 단위로 바로 파일에 기록 (전체 dict를 메모리에 만들지 않음)"""
+        with open(path, 'wb') as f:
+            f.write(b'{"type":"FeatureCollection","features":[')
+            for k, feature in enumerate(self._iter_geojson_features(journeys)):
+                if k:
+                    f.write(b',')
+                f.write(json_bytes(feature))
+            f.write(b']}')
+    
+    def _iter_geojson_features(self, journeys: List[VisualizationJourney]) -> Iterator[Dict]:
+        """경로 구간별 LineString / 시작점 Point 피처를 차례로 생성"""
         for journey in journeys:
             for i, segment in enumerate(journey.segments):
                 if len(segment.coordinates) >= 2:
@@ -1453,10 +2241,10 @@ class GangnamRAPTORVisualizer:
                         },
                         "geometry": {
                             "type": "LineString",
-                            "coordinates": [[lon, lat] for lat, lon in segment.coordinates]
+                            "coordinates": np.column_stack([segment.lons, segment.lats]).tolist()
                         }
                     }
-                    features.append(feature)
+                    yield feature
                 
                 # 시작점/끝점 마커
                 if segment.start_point:
@@ -1474,197 +2262,25 @@ class GangnamRAPTORVisualizer:
                             "coordinates": [segment.start_point[1], segment.start_point[0]]
                         }
                     }
-                    features.append(point_feature)
-        
-        return {
-            "type": "FeatureCollection",
-            "features": features
-        }
+                    yield point_feature
     
     def _generate_html_report(self, journeys: List[VisualizationJourney],
                              statistics: Dict, report_path: Path):
-        """HTML 요약 리포트 생성"""
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html lang="ko">
-        <head>
-            <meta charset="UTF-8">
-            <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <title>강남구 Multi-modal RAPTOR 경로 분석 리포트</title>
-            <style>
-                body {{ font-family: 'Malgun Gothic', Arial, sans-serif; margin: 40px; line-height: 1.6; }}
-                .header {{ text-align: center; margin-bottom: 40px; }}
-                .section {{ margin: 30px 0; padding: 20px; border: 1px solid #ddd; border-radius: 10px; }}
-                .journey {{ margin: 20px 0; padding: 15px; background: #f8f9fa; border-radius: 8px; }}
-                .segment {{ margin: 10px 0; padding: 10px; background: white; border-left: 4px solid #007bff; }}
-                .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; }}
-                .stat-box {{ padding: 15px; background: #e9ecef; border-radius: 8px; text-align: center; }}
-                .emoji {{ font-size: 1.5em; margin-right: 10px; }}
-                table {{ width: 100%; border-collapse: collapse; margin: 20px 0; }}
-                th, td {{ padding: 12px; text-align: left; border-bottom: 1px solid #ddd; }}
-                th {{ background-color: #f8f9fa; font-weight: bold; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>🗺️ 강남구 Multi-modal RAPTOR</h1>
-                <h2>경로 분석 리포트</h2>
-                <p>생성일시: {datetime.now().strftime('%Y년 %m월 %d일 %H:%M:%S')}</p>
-            </div>
-            
-            <div class="section">
-                <h3>📊 전체 통계</h3>
-                <div class="stats">
-                    <div class="stat-box">
-                        <div><span class="emoji">🛣️</span><strong>총 경로 수</strong></div>
-                        <div style="font-size: 2em; color: #007bff;">{statistics.get('total_journeys', 0)}</div>
-                    </div>
-                    <div class="stat-box">
-                        <div><span class="emoji">⏱️</span><strong>평균 소요시간</strong></div>
-                        <div style="font-size: 1.5em; color: #28a745;">{statistics.get('time_stats', {}).get('avg', 0):.1f}분</div>
-                    </div>
-                    <div class="stat-box">
-                        <div><span class="emoji">💰</span><strong>평균 요금</strong></div>
-                        <div style="font-size: 1.5em; color: #ffc107;">{statistics.get('cost_stats', {}).get('avg', 0):.0f}원</div>
-                    </div>
-                    <div class="stat-box">
-                        <div><span class="emoji">📏</span><strong>평균 거리</strong></div>
-                        <div style="font-size: 1.5em; color: #17a2b8;">{statistics.get('distance_stats', {}).get('avg', 0):.1f}km</div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="section">
-                <h3>🚗 교통수단별 분석</h3>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>교통수단</th>
-                            <th>경로 수</th>
-                            <th>평균 시간</th>
-                            <th>평균 요금</th>
-                            <th>평균 거리</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        # 교통수단별 통계 테이블
-        type_emojis = {
-            'walk': '🚶‍♂️', 'bike': '🚲', 'transit': '🚇', 'mixed': '🔄'
-        }
-        
-        for journey_type, type_stats in statistics.get('journey_types', {}).items():
-            emoji = type_emojis.get(journey_type, '🚌')
-            html_content += f"""
-                        <tr>
-                            <td>{emoji} {journey_type.upper()}</td>
-                            <td>{type_stats['count']}개</td>
-                            <td>{type_stats['avg_time']:.1f}분</td>
-                            <td>{type_stats['avg_cost']:.0f}원</td>
-                            <td>{type_stats['avg_distance']:.1f}km</td>
-                        </tr>
-            """
-        
-        html_content += """
-                    </tbody>
-                </table>
-            </div>
-            
-            <div class="section">
-                <h3>🏆 효율성 순위</h3>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>순위</th>
-                            <th>경로</th>
-                            <th>교통수단</th>
-                            <th>소요시간</th>
-                            <th>요금</th>
-                            <th>효율성 점수</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-        """
-        
-        # 효율성 순위 테이블
-        for i, ranking in enumerate(statistics.get('efficiency_rankings', [])[:5], 1):
-            emoji = type_emojis.get(ranking['journey_type'], '🚌')
-            html_content += f"""
-                        <tr>
-                            <td>#{i}</td>
-                            <td>경로 {ranking['journey_id']}</td>
-                            <td>{emoji} {ranking['journey_type'].upper()}</td>
-                            <td>{ranking['total_time']}분</td>
-                            <td>{ranking['total_cost']:,.0f}원</td>
-                            <td>{ranking['efficiency_score']:.2f}</td>
-                        </tr>
-            """
-        
-        html_content += """
-                    </tbody>
-                </table>
-            </div>
-            
-            <div class="section">
-                <h3>🗺️ 상세 경로 정보</h3>
-        """
-        
-        # 각 경로별 상세 정보
-        for journey in journeys:
-            type_emoji = type_emojis.get(journey.journey_type, '🚌')
-            html_content += f"""
-                <div class="journey">
-                    <h4>{type_emoji} 경로 {journey.journey_id} ({journey.journey_type.upper()})</h4>
-                    <p><strong>총 소요시간:</strong> {journey.total_time}분 | 
-                       <strong>총 요금:</strong> {journey.total_cost:,.0f}원 | 
-                       <strong>총 거리:</strong> {journey.summary_stats['total_distance_km']}km</p>
-                    
-                    <h5>세부 구간:</h5>
-            """
-            
-            for i, segment in enumerate(journey.segments, 1):
-                mode_emojis = {
-                    'walk': '🚶‍♂️', 'bike': '🚲', 'transit': '🚇',
-                    'bike_rental': '🔄', 'bike_return': '🔄'
-                }
-                mode_emoji = mode_emojis.get(segment.mode, '🚌')
-                
-                html_content += f"""
-                    <div class="segment">
-                        <strong>{i}. {mode_emoji} {segment.route_name}</strong><br>
-                        소요시간: {segment.duration}분 | 거리: {segment.distance:.2f}km | 요금: {segment.cost:,.0f}원
-                    </div>
-                """
-            
-            html_content += "</div>"
-        
-        html_content += """
-            </div>
-            
-            <div class="section">
-                <h3>📁 생성된 파일들</h3>
-                <ul>
-                    <li><strong>interactive_route_map.html</strong> - 대화형 지도 (클릭하여 열기)</li>
-                    <li><strong>route_visualization.html</strong> - Plotly 시각화</li>
-                    <li><strong>route_comparison.html</strong> - 경로 비교 차트</li>
-                    <li><strong>routes.geojson</strong> - GIS 소프트웨어용 경로 데이터</li>
-                    <li><strong>route_statistics.json</strong> - 상세 통계 데이터</li>
-                    <li><strong>visualization_data.json</strong> - 시각화 원본 데이터</li>
-                </ul>
-            </div>
-            
-            <div style="text-align: center; margin-top: 40px; color: #6c757d;">
-                <p>🎯 강남구 Multi-modal RAPTOR 시스템으로 생성됨</p>
-                <p>Python + GTFS + 실제 도로망 기반 정확한 경로 시각화</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        """HTML 요약 리포트 생성 (본문만 Jinja2로 렌더링/인코딩, 정적 머리/꼬리는 미리 인코딩된 bytes)"""
+        html_content = _report_template().render(
+            journey_rows=[(journey, _format_journey_row(journey)) for journey in journeys],
+            statistics=statistics,
+            top_rankings=statistics.get('efficiency_rankings', [])[:5],
+            generated_at=datetime.now().strftime('%Y년 %m월 %d일 %H:%M:%S'),
+            # dict 대신 바인딩된 .get을 넘겨 행마다 템플릿의 속성 조회를 생략
+            type_emoji_of=_JOURNEY_TYPE_EMOJI.get,
+            mode_emoji_of=_MODE_EMOJIS.get
+        )
+        _write_css_once(report_path.parent)
+        with open(report_path, 'wb') as f:
+            f.write(_REPORT_HEAD_BYTES)
+            f.write(html_content.encode('utf-8'))
+            f.write(_REPORT_FOOT_BYTES)
     
     def print_visualization_summary(self, results: Dict[str, Any]):
         """시각화 결과 요약 출력"""
@@ -1675,60 +2291,48 @@ class GangnamRAPTORVisualizer:
         statistics = results.get('statistics', {})
         file_paths = results.get('file_paths', {})
         
-        print("\n" + "="*70)
-        print("🎨 강남구 Multi-modal RAPTOR 시각화 결과 요약")
-        print("="*70)
+        # 줄을 모아 두었다가 한 번에 출력 (print 호출 대신)
+        lines = ["\n" + "="*70, "🎨 강남구 Multi-modal RAPTOR 시각화 결과 요약", "="*70]
         
         if journeys:
-            print(f"\n📊 시각화된 경로: {len(journeys)}개")
+            lines.append(f"\n📊 시각화된 경로: {len(journeys)}개")
             
             for journey in journeys:
-                type_emoji = {
-                    'walk': '🚶‍♂️', 'bike': '🚲', 'transit': '🚇', 'mixed': '🔄'
-                }.get(journey.journey_type, '🚌')
-                
-                print(f"   {type_emoji} 경로 {journey.journey_id}: {journey.total_time}분, "
-                      f"{journey.total_cost:,.0f}원, {journey.summary_stats['total_distance_km']}km")
+                type_emoji, time_str, cost_str, distance_str = _format_journey_row(journey)
+                lines.append(f"   {type_emoji} 경로 {journey.journey_id}: {time_str}, {cost_str}, {distance_str}")
         
         if statistics:
-            print(f"\n📈 통계 요약:")
+            lines.append(f"\n📈 통계 요약:")
             time_stats = statistics.get('time_stats', {})
             cost_stats = statistics.get('cost_stats', {})
             
-            print(f"   ⏱️ 소요시간: 최단 {time_stats.get('min', 0)}분, "
-                  f"최장 {time_stats.get('max', 0)}분, 평균 {time_stats.get('avg', 0):.1f}분")
-            print(f"   💰 요금: 최저 {cost_stats.get('min', 0):,.0f}원, "
-                  f"최고 {cost_stats.get('max', 0):,.0f}원, 평균 {cost_stats.get('avg', 0):.0f}원")
+            lines.append(f"   ⏱️ 소요시간: 최단 {time_stats.get('min', 0)}분, "
+                         f"최장 {time_stats.get('max', 0)}분, 평균 {time_stats.get('avg', 0):.1f}분")
+            lines.append(f"   💰 요금: 최저 {cost_stats.get('min', 0):,.0f}원, "
+                         f"최고 {cost_stats.get('max', 0):,.0f}원, 평균 {cost_stats.get('avg', 0):.0f}원")
             
             # 가장 효율적인 경로
             rankings = statistics.get('efficiency_rankings', [])
             if rankings:
                 best = rankings[0]
-                print(f"   🏆 가장 효율적: 경로 {best['journey_id']} ({best['journey_type']})")
+                lines.append(f"   🏆 가장 효율적: 경로 {best['journey_id']} ({best['journey_type']})")
         
         if file_paths:
-            print(f"\n📁 생성된 파일:")
+            lines.append(f"\n📁 생성된 파일:")
+            icon_of = _FILE_ICONS.get
             for file_type, path in file_paths.items():
-                file_icons = {
-                    'interactive_map': '🗺️',
-                    'plotly_visualization': '📊',
-                    'comparison_chart': '📈',
-                    'static_image': '🖼️',
-                    'statistics': '📋',
-                    'geojson': '🌍',
-                    'report': '📄'
-                }
-                icon = file_icons.get(file_type, '📄')
-                print(f"   {icon} {Path(path).name}")
-        
-        print(f"\n💡 사용법:")
-        print(f"   1. interactive_route_map.html을 브라우저로 열어 대화형 지도 확인")
-        print(f"   2. route_comparison.html에서 경로 성능 비교")
-        print(f"   3. routes.geojson을 QGIS 등에서 열어 상세 분석")
-        print(f"   4. visualization_report.html에서 종합 리포트 확인")
-        
-        print(f"\n🎉 강남구 Multi-modal RAPTOR 시각화 완료!")
-        print("="*70)
+                icon = icon_of(file_type, '📄')
+                lines.append(f"   {icon} {Path(path).name}")
+        
+        lines.append(f"\n💡 사용법:")
+        lines.append(f"   1. interactive_route_map.html을 브라우저로 열어 대화형 지도 확인")
+        lines.append(f"   2. route_comparison.html에서 경로 성능 비교")
+        lines.append(f"   3. routes.geojson을 QGIS 등에서 열어 상세 분석")
+        lines.append(f"   4. visualization_report.html에서 종합 리포트 확인")
+        
+        lines.append(f"\n🎉 강남구 Multi-modal RAPTOR 시각화 완료!")
+        lines.append("="*70)
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 # =============================================================================
@@ -1883,22 +2487,25 @@ if __name__ == "__main__":
         # 디버깅 코드
         if 'visualization_journeys' in visualization_results:
             journeys = visualization_results['visualization_journeys']
-            print(f"\n📊 총 {len(journeys)}개 경로 분석:")
+            # 줄을 모아 두었다가 한 번에 출력 (구간마다 print 호출 대신)
+            lines = [f"\n📊 총 {len(journeys)}개 경로 분석:"]
             
             for journey in journeys:
-                print(f"\n--- 경로 {journey.journey_id} ({journey.journey_type}) ---")
-                print(f"세그먼트 수: {len(journey.segments)}")
+                lines.append(f"\n--- 경로 {journey.journey_id} ({journey.journey_type}) ---")
+                lines.append(f"세그먼트 수: {len(journey.segments)}")
                 
                 for i, segment in enumerate(journey.segments):
-                    print(f"  {i+1}. {segment.mode} - {segment.route_name}")
-                    print(f"     좌표 개수: {len(segment.coordinates)}")
-                    print(f"     색상: {segment.color}")
+                    lines.append(f"  {i+1}. {segment.mode} - {segment.route_name}")
+                    lines.append(f"     좌표 개수: {len(segment.coordinates)}")
+                    lines.append(f"     색상: {segment.color}")
                     
                     if len(segment.coordinates) >= 2:
-                        print(f"     시작: {segment.coordinates[0]}")
-                        print(f"     끝: {segment.coordinates[-1]}")
+                        lines.append(f"     시작: {tuple(segment.coordinates[0].tolist())}")
+                        lines.append(f"     끝: {tuple(segment.coordinates[-1].tolist())}")
                     else:
-                        print(f"     ⚠️ 좌표 부족! (경로선이 안 보이는 원인)")
+                        lines.append(f"     ⚠️ 좌표 부족! (경로선이 안 보이는 원인)")
+            
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print("❌ 시각화 데이터가 없습니다!")
         
@@ -1922,4 +2529,5 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        # 트레이스백을 한 문자열로 만들어 stderr에 한 번에 기록
+        sys.stderr.write(''.join(traceback.TracebackException.from_exception(e).format()))
\ No newline at end of file
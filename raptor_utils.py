@@ -0,0 +1,43 @@
+"""
+강남구 Multi-modal RAPTOR 공용 유틸리티
+
+Part2(경로 탐색)와 Part3(시각화)가 함께 쓰는 좌표 배열 변환과 JSON 직렬화
+"""
+
+import json
+
+import numpy as np
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def coords_array(coordinates) -> np.ndarray:
+    """좌표 목록을 (N, 2) [lat, lon] float64 배열로 변환
+
+    float32는 WGS84 좌표에서 약 1m 정밀도를 잃으므로 float64를 사용
+    """
+    return np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+
+def json_default(obj):
+    """표준 json 폴백용 NumPy 변환"""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def json_bytes(data, indent: bool = False, default=None) -> bytes:
+    """JSON 직렬화 (orjson 우선, 없으면 표준 json / 한글 그대로 UTF-8)
+
+    default는 NumPy 외의 타입 변환용 (예: str)
+    """
+    if ORJSON_AVAILABLE:
+        option = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+                  | (orjson.OPT_INDENT_2 if indent else 0))
+        return orjson.dumps(data, default=default, option=option)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False,
+                      default=default or json_default).encode('utf-8')
@@ -0,0 +1,62 @@
+"""
+RAPTOR 목적지 pruning 회귀 테스트
+
+출발지와 목적지가 함께 도보로 닿는 정류장이 있어도 대중교통 경로가 사라지지 않아야 한다.
+"""
+
+import contextlib
+import io
+import pickle
+import sys
+from pathlib import Path
+
+import networkx as nx
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import part2_raptor_algorithm as p2
+
+
+def _write_dataset(data_path: Path):
+    """정류장 3개(A-X-B, 위도 37.5 위 일직선)와 A→B 지하철 trip 1개짜리 데이터
+
+    X는 출발지/목적지 모두에서 도보 15분 이내라 Round 0에서 바로 하차 정류장에 도달한다.
+    """
+    pd.DataFrame(
+        [('A', '출발역', 37.5, 127.001), ('X', '중간정류장', 37.5, 127.010), ('B', '도착역', 37.5, 127.019)],
+        columns=['stop_id', 'stop_name', 'stop_lat', 'stop_lon']
+    ).to_csv(data_path / 'gangnam_stops.csv', index=False)
+    pd.DataFrame(
+        [('R1', '2호선', 1, '2호선')],
+        columns=['route_id', 'route_short_name', 'route_type', 'route_long_name']
+    ).to_csv(data_path / 'gangnam_routes.csv', index=False)
+    
+    # 08:05 A 출발 → 08:40 B 도착 (도보만으로 X에 닿는 시각보다 늦음)
+    trip_schedules = {'R1_T1': [
+        {'stop_id': 'A', 'arrival': 485, 'departure': 485, 'sequence': 0},
+        {'stop_id': 'B', 'arrival': 520, 'departure': 520, 'sequence': 1}
+    ]}
+    with open(data_path / 'gangnam_raptor_structures.pkl', 'wb') as f:
+        pickle.dump({'route_patterns': {'R1': ['A', 'B']},
+                     'stop_routes': {'A': ['R1'], 'B': ['R1']},
+                     'trip_schedules': trip_schedules,
+                     'transfers': {}}, f)
+    
+    # 기본 그리드 생성을 피하기 위한 최소 도로 그래프
+    road_graph = nx.Graph()
+    road_graph.add_edge((37.5, 127.0), (37.5, 127.02), distance=1.76, walk_time=23.5, bike_time=8.8)
+    with open(data_path / 'gangnam_road_graph.pkl', 'wb') as f:
+        pickle.dump(road_graph, f)
+
+
+def test_walkable_shared_stop_does_not_prune_transit(tmp_path):
+    _write_dataset(tmp_path)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        raptor = p2.GangnamMultiModalRAPTOR(str(tmp_path))
+        journeys = raptor._find_transit_routes(37.5, 127.0, 37.5, 127.02, 480,
+                                               False, {'max_walk_time': 15})
+    
+    transit = [(j.journey_type, j.total_time, j.total_cost) for j in journeys]
+    assert transit == [('transit', 41, 1370.0)]